@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+    
+    def ready(self):
+        from . import checks, signals  # noqa: F401
+        from utils.cache import watch_model
+        watch_model(self.get_model('User'), ignore_fields=('last_login', 'password'))
@@ -0,0 +1,126 @@
+import threading
+import time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.crypto import salted_hmac
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+_users = {}
+_lock = threading.Lock()
+
+def _version_key(user_id):
+    return f'auth:version:{user_id}'
+
+def _version_timeout():
+    return int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+
+def auth_version(user):
+    """Digest of everything an access token's claims vouch for.
+    
+    Changing the username, name, role, active flag or password gives the
+    user a new version.
+    """
+    state = '\x00'.join(str(value) for value in (
+        user.username, user.first_name, user.last_name,
+        user.role, user.is_active, user.password
+    ))
+    return salted_hmac('accounts.auth_version', state).hexdigest()[:20]
+
+def remember_user(user):
+    """Publish ``user``'s version unless a newer one is already published.
+    
+    Called with rows read from the database, which may predate an edit that
+    is committing concurrently; ``cache.add`` never overwrites its version.
+    """
+    version = auth_version(user)
+    cache.add(_version_key(user.pk), version, timeout=_version_timeout())
+    return version
+
+def invalidate_user(user_id, version=''):
+    """Stop trusting the claims of tokens issued to ``user_id`` so far.
+    
+    ``version`` is the user's new version, or empty once the user is gone.
+    Tokens that do not carry it load the user again, and this process drops
+    its cached copy of the user.
+    """
+    with _lock:
+        _users.pop(str(user_id), None)
+    cache.set(_version_key(user_id), version, timeout=_version_timeout())
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that avoids loading ``accounts.User`` on every request.
+    
+    Access tokens issued by ``RoleRefreshToken`` carry the user's profile
+    claims and ``auth_version``. With ``AUTH_TRUST_TOKEN_CLAIMS`` on, the
+    claims are used as the user while that version is still the one
+    published in the shared cache; saving or deleting a user publishes a new
+    one (see ``accounts.signals``).
+    
+    Every other token resolves through a per-process copy of the user, kept
+    for ``AUTH_USER_CACHE_TTL`` seconds. A save or delete drops it in the
+    process that made it; other processes notice a newly published version
+    when the cache is shared, and otherwise within the TTL. Loading the user
+    also rejects deleted and inactive accounts.
+    """
+    
+    def get_user(self, validated_token):
+        key = self.version_key(validated_token)
+        if key and cache.get(key) == validated_token['auth_version']:
+            return self.user_from_claims(validated_token)
+        return self.load_user(validated_token)
+    
+    async def aauthenticate(self, request):
+        """``authenticate`` for async views.
+        
+        Only tokens whose claims cannot be trusted load the user, in a thread.
+        """
+        header = self.get_header(request)
+        raw_token = self.get_raw_token(header) if header is not None else None
+        if raw_token is None:
+            return None
+        
+        validated_token = self.get_validated_token(raw_token)
+        key = self.version_key(validated_token)
+        if key and await cache.aget(key) == validated_token['auth_version']:
+            return self.user_from_claims(validated_token), validated_token
+        
+        return await sync_to_async(self.load_user)(validated_token), validated_token
+    
+    def version_key(self, validated_token):
+        """Cache key holding the version the token must match, if it can be trusted at all."""
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if not settings.AUTH_TRUST_TOKEN_CLAIMS or user_id is None:
+            return None
+        if not (validated_token.get('role') and validated_token.get('auth_version')):
+            return None
+        return _version_key(user_id)
+    
+    def user_from_claims(self, validated_token):
+        return self.user_model(
+            **{api_settings.USER_ID_FIELD: validated_token[api_settings.USER_ID_CLAIM]},
+            username=validated_token.get('username', ''),
+            first_name=validated_token.get('first_name', ''),
+            last_name=validated_token.get('last_name', ''),
+            role=validated_token['role'],
+            is_active=True
+        )
+    
+    def load_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        key = str(user_id)
+        now = time.monotonic()
+        with _lock:
+            cached = _users.get(key)
+        if cached and cached[1] > now:
+            user, _, version = cached
+            published = cache.get(_version_key(user_id))
+            if published is None or published == version:
+                return user
+        
+        user = super().get_user(validated_token)
+        version = remember_user(user)
+        with _lock:
+            _users[key] = (user, now + settings.AUTH_USER_CACHE_TTL, version)
+        return user
@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+@register()
+def check_trusted_claims_cache(app_configs, **kwargs):
+    backend = settings.CACHES['default']['BACKEND']
+    if settings.AUTH_TRUST_TOKEN_CLAIMS and backend.endswith(('LocMemCache', 'DummyCache')):
+        return [Warning(
+            'AUTH_TRUST_TOKEN_CLAIMS is on but the default cache is not shared between workers.',
+            hint='Edited or deleted users keep their access in other workers; point '
+                 'CACHE_BACKEND at a shared cache or turn AUTH_TRUST_TOKEN_CLAIMS off.',
+            id='accounts.W001',
+        )]
+    return []
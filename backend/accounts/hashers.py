@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with the iteration count taken from ``PASSWORD_PBKDF2_ITERATIONS``.
+    
+    It keeps the ``pbkdf2_sha256`` algorithm name, so existing hashes still
+    verify and Django re-hashes them at the new cost on the next login.
+    """
+    
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS or PBKDF2PasswordHasher.iterations
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .authentication import auth_version, invalidate_user
+from .models import User
+
+@receiver(post_save, sender=User)
+def publish_auth_version(sender, instance, update_fields=None, raw=False, **kwargs):
+    # Logging in only touches last_login, which no token claim depends on.
+    if raw or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    invalidate_user(instance.pk, auth_version(instance))
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
@@ -1,3 +1,104 @@
-from django.test import TestCase
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from accounts.models import User
+from utils.testing import APIFixtureTestCase, ListQueryCountTestCase
 
-# Create your tests here.
+class TeacherListQueryCountTests(ListQueryCountTestCase):
+    def add_teachers(self, count):
+        start = User.objects.count()
+        for i in range(count):
+            User.objects.create_user(f'teacher{start + i}', password='secret', role='teacher')
+    
+    def test_list_query_count_is_constant(self):
+        self.assertConstantQueries('/api/auth/teachers/', self.add_teachers)
+
+class DefaultAuthenticationTests(APIFixtureTestCase):
+    def test_default_settings_skip_the_user_query_after_the_first_request(self):
+        response = self.client.post('/api/auth/login/', {'username': 'teacher', 'password': 'secret'}, format='json')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        client.get('/api/classes/')
+        
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(client.get('/api/classes/').status_code, 200)
+        self.assertFalse(any('FROM "accounts_user"' in q['sql'] for q in context.captured_queries))
+
+@override_settings(AUTH_TRUST_TOKEN_CLAIMS=True)
+class CachedJWTAuthenticationTests(APIFixtureTestCase):
+    def login(self, username):
+        response = self.client.post('/api/auth/login/', {'username': username, 'password': 'secret'}, format='json')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        return client
+    
+    def test_role_claims_skip_the_user_query(self):
+        client = self.login('teacher')
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/classes/')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any('FROM "accounts_user"' in q['sql'] for q in context.captured_queries))
+        self.assertEqual(client.get('/api/auth/me/').data['username'], 'teacher')
+    
+    def test_deleted_teacher_token_is_rejected(self):
+        client = self.login('teacher')
+        self.assertEqual(self.client.delete(f'/api/auth/teachers/{self.teacher.id}/').status_code, 204)
+        self.assertEqual(client.get('/api/classes/').status_code, 401)
+    
+    def test_deactivated_teacher_token_is_rejected(self):
+        client = self.login('teacher')
+        self.teacher.is_active = False
+        self.teacher.save()
+        self.assertEqual(client.get('/api/classes/').status_code, 401)
+    
+    def test_role_change_stops_trusting_the_claims(self):
+        client = self.login('teacher')
+        self.teacher.role = 'student'
+        self.teacher.save(update_fields=['role'])
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(client.get('/api/classes/').status_code, 403)
+        self.assertTrue(any('FROM "accounts_user"' in q['sql'] for q in context.captured_queries))
+    
+    @override_settings(AUTH_TRUST_TOKEN_CLAIMS=False)
+    def test_without_a_shared_cache_the_user_is_loaded_once_per_process(self):
+        client = self.login('teacher')
+        user_queries = lambda context: [q for q in context.captured_queries if 'FROM "accounts_user"' in q['sql']]
+        
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(client.get('/api/classes/').status_code, 200)
+        self.assertEqual(len(user_queries(context)), 1)
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(client.get('/api/classes/').status_code, 200)
+        self.assertEqual(user_queries(context), [])
+        
+        self.teacher.is_active = False
+        self.teacher.save()
+        self.assertEqual(client.get('/api/classes/').status_code, 401)
+
+class LoginTests(APIFixtureTestCase):
+    def login(self, username, password='secret', **extra):
+        return self.client.post('/api/auth/login/', {'username': username, 'password': password}, format='json', **extra)
+    
+    @override_settings(PASSWORD_HASHERS=[
+        'django.contrib.auth.hashers.Argon2PasswordHasher',
+        'accounts.hashers.ConfigurablePBKDF2PasswordHasher',
+    ])
+    def test_login_rehashes_with_the_preferred_hasher(self):
+        self.assertTrue(self.teacher.password.startswith('pbkdf2_sha256$'))
+        self.assertEqual(self.login('teacher').status_code, 200)
+        self.teacher.refresh_from_db()
+        self.assertTrue(self.teacher.password.startswith('argon2$'))
+    
+    @override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+    def test_pbkdf2_iterations_are_configurable(self):
+        self.assertEqual(self.login('teacher').status_code, 200)
+        self.teacher.refresh_from_db()
+        self.assertTrue(self.teacher.password.startswith('pbkdf2_sha256$1000$'))
+    
+    def test_repeated_attempts_for_a_username_are_throttled(self):
+        for i in range(10):
+            response = self.login('teacher', 'wrong', REMOTE_ADDR=f'10.0.0.{i}')
+            self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.login('teacher', REMOTE_ADDR='10.0.1.1').status_code, 429)
+        self.assertEqual(self.login('owner', REMOTE_ADDR='10.0.1.1').status_code, 200)
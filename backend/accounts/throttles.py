@@ -0,0 +1,18 @@
+from rest_framework.throttling import SimpleRateThrottle
+
+class LoginIPThrottle(SimpleRateThrottle):
+    """Limit login attempts per client address."""
+    scope = 'login_ip'
+    
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+class LoginUsernameThrottle(SimpleRateThrottle):
+    """Limit login attempts per username, whichever address they come from."""
+    scope = 'login_username'
+    
+    def get_cache_key(self, request, view):
+        username = request.data.get('username')
+        if not username:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': str(username).lower()}
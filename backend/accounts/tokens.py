@@ -0,0 +1,20 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+from .authentication import remember_user
+
+class RoleRefreshToken(RefreshToken):
+    """Refresh token that also carries the user's role and profile.
+    
+    The claims are copied onto the access token, which lets
+    ``CachedJWTAuthentication`` answer permission checks without a query
+    until the user's ``auth_version`` changes.
+    """
+    
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['role'] = user.role
+        token['username'] = user.username
+        token['first_name'] = user.first_name
+        token['last_name'] = user.last_name
+        token['auth_version'] = remember_user(user)
+        return token
@@ -1,12 +1,15 @@
 from rest_framework import generics, status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model, authenticate
+from django.shortcuts import get_object_or_404
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from .serializers import RegisterSerializer, UserSerializer, TeacherSerializer, TeacherCreateSerializer
 from .permissions import IsOwner
+from utils.cache import CachedResponseMixin
+from .throttles import LoginIPThrottle, LoginUsernameThrottle
+from .tokens import RoleRefreshToken
 
 User = get_user_model()
 
@@ -22,6 +25,7 @@ class RegisterView(generics.CreateAPIView):
 class LoginView(APIView):
     authentication_classes = []
     permission_classes = (permissions.AllowAny,)
+    throttle_classes = (LoginIPThrottle, LoginUsernameThrottle)
     
     def post(self, request):
         username = request.data.get('username')
@@ -30,7 +34,7 @@ class LoginView(APIView):
         user = authenticate(username=username, password=password)
         
         if user:
-            refresh = RefreshToken.for_user(user)
+            refresh = RoleRefreshToken.for_user(user)
             return Response({
                 'refresh': str(refresh),
                 'access': str(refresh.access_token),
@@ -43,13 +47,16 @@ class CurrentUserView(APIView):
     permission_classes = (permissions.IsAuthenticated,)
     
     def get(self, request):
-        serializer = UserSerializer(request.user)
+        # request.user only holds the token claims; load the full profile.
+        user = get_object_or_404(User, pk=request.user.pk)
+        serializer = UserSerializer(user)
         return Response(serializer.data)
 
-class TeacherListView(generics.ListAPIView):
+class TeacherListView(CachedResponseMixin, generics.ListAPIView):
     queryset = User.objects.filter(role='teacher')
     serializer_class = TeacherSerializer
     permission_classes = (IsOwner,)
+    cache_models = (User,)
 
 class TeacherCreateView(generics.CreateAPIView):
     queryset = User.objects.all()
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:28
+
+import attendance.models
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='attendance',
+            name='date',
+            field=models.DateField(default=django.utils.timezone.localdate),
+        ),
+        migrations.AlterField(
+            model_name='attendance',
+            name='time',
+            field=models.TimeField(default=attendance.models.current_time),
+        ),
+    ]
@@ -1,13 +1,32 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from students.models import Student
 from classes.models import Class
 
+def current_time():
+    return timezone.localtime().time()
+
+class AttendanceQuerySet(models.QuerySet):
+    def for_api(self):
+        return self.select_related('student', 'class_attended', 'marked_by')
+    
+    def filter_params(self, params):
+        """Apply the ``date``, ``class_id`` and ``student_id`` query parameters."""
+        queryset = self
+        if params.get('date'):
+            queryset = queryset.filter(date=params['date'])
+        if params.get('class_id'):
+            queryset = queryset.filter(class_attended_id=params['class_id'])
+        if params.get('student_id'):
+            queryset = queryset.filter(student_id=params['student_id'])
+        return queryset
+
 class Attendance(models.Model):
     student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='attendances')
     class_attended = models.ForeignKey(Class, on_delete=models.CASCADE, related_name='attendances')
-    date = models.DateField(auto_now_add=True)
-    time = models.TimeField(auto_now_add=True)
+    date = models.DateField(default=timezone.localdate)
+    time = models.TimeField(default=current_time)
     marked_by = models.ForeignKey(
         settings.AUTH_USER_MODEL, 
         on_delete=models.SET_NULL, 
@@ -17,9 +36,17 @@ class Attendance(models.Model):
     sms_sent = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = AttendanceQuerySet.as_manager()
+    
     class Meta:
         unique_together = ['student', 'class_attended', 'date']
         ordering = ['-date', '-time']
+        indexes = [
+            models.Index(fields=['-date', '-time'], name='attendance_date_time_idx'),
+            models.Index(fields=['date', 'class_attended'], name='attendance_date_class_idx'),
+            models.Index(fields=['class_attended', '-date', '-time'], name='attendance_class_date_idx'),
+            models.Index(fields=['student', '-date', '-time'], name='attendance_student_date_idx'),
+        ]
     
     def __str__(self):
         return f"{self.student.full_name} - {self.class_attended.name} - {self.date}"
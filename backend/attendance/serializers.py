@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from .models import Attendance
 from students.models import Student
+from utils.serializers import DynamicFieldsMixin
 
-class AttendanceSerializer(serializers.ModelSerializer):
+class AttendanceSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.full_name', read_only=True)
     class_name = serializers.CharField(source='class_attended.name', read_only=True)
     marked_by_name = serializers.CharField(source='marked_by.get_full_name', read_only=True)
@@ -13,17 +14,35 @@ class AttendanceSerializer(serializers.ModelSerializer):
                   'date', 'time', 'marked_by', 'marked_by_name', 'sms_sent', 'created_at']
         read_only_fields = ['id', 'date', 'time', 'sms_sent', 'created_at']
 
+def parse_qr_data(value):
+    """Return the student id encoded in a ``STUDENT:<id>:<name>`` QR payload."""
+    parts = value.split(':')
+    if len(parts) != 3 or parts[0] != 'STUDENT':
+        raise serializers.ValidationError("Invalid QR code format")
+    
+    try:
+        return int(parts[1])
+    except ValueError:
+        raise serializers.ValidationError("Invalid student QR code")
+
 class MarkAttendanceSerializer(serializers.Serializer):
     qr_data = serializers.CharField()
     
     def validate_qr_data(self, value):
+        student_id = parse_qr_data(value)
         try:
-            parts = value.split(':')
-            if len(parts) != 3 or parts[0] != 'STUDENT':
-                raise serializers.ValidationError("Invalid QR code format")
-            
-            student_id = int(parts[1])
             student = Student.objects.get(id=student_id)
             return {'student': student}
-        except (ValueError, Student.DoesNotExist):
+        except Student.DoesNotExist:
             raise serializers.ValidationError("Invalid student QR code")
+
+class ScanSerializer(serializers.Serializer):
+    qr_data = serializers.CharField()
+    scanned_at = serializers.DateTimeField(required=False)
+
+class BatchMarkAttendanceSerializer(serializers.Serializer):
+    scans = serializers.ListField(
+        child=ScanSerializer(),
+        allow_empty=False,
+        max_length=1000
+    )
@@ -1,3 +1,176 @@
-from django.test import TestCase
+from unittest import mock
+from asgiref.sync import async_to_sync
+from django.test import override_settings
+from django.test.client import AsyncClient
+from rest_framework.throttling import UserRateThrottle
+from accounts.models import User
+from accounts.tokens import RoleRefreshToken
+from attendance.models import Attendance
+from attendance.views import AsyncMarkAttendanceView
+from notifications.models import OutboundMessage
+from utils.testing import APIFixtureTestCase, ListQueryCountTestCase
 
-# Create your tests here.
+class AttendanceListQueryCountTests(ListQueryCountTestCase):
+    def add_attendance(self, count):
+        for student in self.create_students(count):
+            Attendance.objects.create(
+                student=student,
+                class_attended=student.assigned_class,
+                marked_by=self.teacher
+            )
+    
+    def test_list_query_count_is_constant(self):
+        self.assertConstantQueries('/api/attendance/', self.add_attendance)
+    
+    def test_daily_report_query_count_is_constant(self):
+        self.assertConstantQueries(
+            '/api/attendance/daily-report/?include_attendances=true',
+            self.add_attendance
+        )
+    
+    def test_daily_report_pages_attendances_by_cursor(self):
+        self.add_attendance(3)
+        url = '/api/attendance/daily-report/?include_attendances=true&page_size=2'
+        
+        first = self.client.get(url).data
+        self.assertEqual(first['total_students'], 3)
+        self.assertEqual(len(first['attendances']['results']), 2)
+        second = self.client.get(first['attendances']['next']).data['attendances']
+        self.assertEqual(len(second['results']), 1)
+        self.assertIsNone(second['next'])
+        
+        ids = [row['id'] for row in first['attendances']['results'] + second['results']]
+        self.assertEqual(sorted(ids), sorted(Attendance.objects.values_list('id', flat=True)))
+
+class BatchMarkAttendanceTests(APIFixtureTestCase):
+    def replay(self, *qr_data):
+        response = self.client.post(
+            '/api/attendance/mark/batch/',
+            {'scans': [{'qr_data': qr} for qr in qr_data]},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data
+    
+    def qr(self, student):
+        return f'STUDENT:{student.id}:{student.full_name}'
+    
+    def test_repeated_scans_in_one_batch_create_one_row_and_one_sms(self):
+        first, second = self.create_students(2)
+        
+        data = self.replay(self.qr(first), self.qr(second), self.qr(first))
+        
+        self.assertEqual([r['status'] for r in data['results']], ['created', 'created', 'duplicate'])
+        self.assertEqual(data['summary'], {'created': 2, 'duplicate': 1})
+        self.assertEqual(data['results'][2]['attendance_id'], data['results'][0]['attendance_id'])
+        self.assertEqual(Attendance.objects.count(), 2)
+        for student in (first, second):
+            self.assertEqual(OutboundMessage.objects.filter(attendance__student=student).count(), 1)
+    
+    def test_replayed_scans_of_marked_students_are_duplicates(self):
+        marked, fresh = self.create_students(2)
+        response = self.client.post('/api/attendance/mark/', {'qr_data': self.qr(marked)}, format='json')
+        self.assertEqual(response.status_code, 201)
+        
+        data = self.replay(self.qr(marked), self.qr(fresh))
+        
+        self.assertEqual([r['status'] for r in data['results']], ['duplicate', 'created'])
+        self.assertEqual(data['results'][0]['attendance_id'], response.data['id'])
+        self.assertEqual(OutboundMessage.objects.filter(attendance__student=marked).count(), 1)
+        self.assertEqual(OutboundMessage.objects.count(), 2)
+        
+        data = self.replay(self.qr(marked), self.qr(fresh))
+        self.assertEqual(data['summary'], {'duplicate': 2})
+        self.assertEqual(OutboundMessage.objects.count(), 2)
+    
+    def test_unreadable_unknown_and_unassigned_scans_are_reported(self):
+        student, unassigned = self.create_students(2)
+        unassigned.assigned_class = None
+        unassigned.save()
+        
+        data = self.replay('bogus', 'STUDENT:999:Nobody', self.qr(unassigned), self.qr(student))
+        
+        self.assertEqual(
+            [r['status'] for r in data['results']],
+            ['invalid_qr', 'unknown_student', 'no_class', 'created']
+        )
+        self.assertEqual(Attendance.objects.get().student, student)
+        self.assertEqual(OutboundMessage.objects.count(), 1)
+
+class ScanThrottle(UserRateThrottle):
+    rate = '1/min'
+
+@override_settings(AUTH_TRUST_TOKEN_CLAIMS=True)
+class AsyncMarkAttendanceTests(APIFixtureTestCase):
+    def scan(self, qr_data, token=None):
+        headers = {}
+        if token is not False:
+            token = token or str(RoleRefreshToken.for_user(self.teacher).access_token)
+            headers['Authorization'] = f'Bearer {token}'
+        
+        async def post():
+            return await AsyncClient().post(
+                '/api/attendance/mark/async/',
+                {'qr_data': qr_data},
+                content_type='application/json',
+                headers=headers
+            )
+        
+        return async_to_sync(post)()
+    
+    def test_scan_marks_once_and_queues_sms(self):
+        student = self.create_students(1)[0]
+        qr_data = f'STUDENT:{student.id}:{student.full_name}'
+        
+        response = self.scan(qr_data)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['student_name'], student.full_name)
+        self.assertEqual(response.json()['marked_by'], self.teacher.id)
+        
+        response = self.scan(qr_data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Attendance.objects.filter(student=student).count(), 1)
+        self.assertEqual(OutboundMessage.objects.filter(attendance__student=student).count(), 1)
+    
+    def test_errors_match_sync_view(self):
+        student = self.create_students(1)[0]
+        student.assigned_class = None
+        student.save()
+        
+        for qr_data in ('bogus', 'STUDENT:999:Nobody', f'STUDENT:{student.id}:{student.full_name}'):
+            sync_response = self.client.post('/api/attendance/mark/', {'qr_data': qr_data}, format='json')
+            async_response = self.scan(qr_data)
+            self.assertEqual(async_response.status_code, sync_response.status_code)
+            self.assertEqual(async_response.json(), sync_response.json())
+        
+        self.assertEqual(self.scan('bogus', token=False).status_code, 401)
+        self.assertEqual(self.scan('bogus', token='not-a-token').status_code, 401)
+    
+    def test_inactive_users_and_students_are_refused(self):
+        token = str(RoleRefreshToken.for_user(self.teacher).access_token)
+        self.teacher.is_active = False
+        self.teacher.save()
+        self.assertEqual(self.scan('bogus', token=token).status_code, 401)
+        
+        student = User.objects.create_user('student', password='secret')
+        self.assertEqual(self.scan('bogus', token=str(RoleRefreshToken.for_user(student).access_token)).status_code, 403)
+    
+    def test_configured_throttles_apply(self):
+        with mock.patch.object(AsyncMarkAttendanceView, 'throttle_classes', (ScanThrottle,)):
+            self.assertEqual(self.scan('bogus').status_code, 400)
+            response = self.scan('bogus')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+    
+    def test_marked_by_name_comes_from_the_token(self):
+        self.teacher.first_name, self.teacher.last_name = 'Nimal', 'Perera'
+        self.teacher.save()
+        token = str(RoleRefreshToken.for_user(self.teacher).access_token)
+        students = self.create_students(2)
+        
+        self.client.force_authenticate(None)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response = self.client.post('/api/attendance/mark/', {'qr_data': f'STUDENT:{students[0].id}:x'}, format='json')
+        self.assertEqual(response.data['marked_by_name'], 'Nimal Perera')
+        response = self.scan(f'STUDENT:{students[1].id}:x', token=token)
+        self.assertEqual(response.json()['marked_by_name'], 'Nimal Perera')
@@ -1,8 +1,18 @@
 from django.urls import path
-from .views import AttendanceListView, MarkAttendanceView, DailyReportView
+from .views import (
+    AttendanceListView,
+    AttendanceExportView,
+    MarkAttendanceView,
+    AsyncMarkAttendanceView,
+    BatchMarkAttendanceView,
+    DailyReportView
+)
 
 urlpatterns = [
     path('', AttendanceListView.as_view(), name='attendance-list'),
+    path('export/', AttendanceExportView.as_view(), name='attendance-export'),
     path('mark/', MarkAttendanceView.as_view(), name='mark-attendance'),
+    path('mark/async/', AsyncMarkAttendanceView.as_view(), name='mark-attendance-async'),
+    path('mark/batch/', BatchMarkAttendanceView.as_view(), name='mark-attendance-batch'),
     path('daily-report/', DailyReportView.as_view(), name='daily-report'),
 ]
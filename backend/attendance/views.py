@@ -1,31 +1,71 @@
-from rest_framework import generics, permissions, status
+from asgiref.sync import sync_to_async
+from rest_framework import generics, permissions, serializers, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from django.db import transaction
+from django.db.models import Count, Sum
 from django.utils import timezone
 from datetime import datetime
+from decimal import Decimal
 from .models import Attendance
-from .serializers import AttendanceSerializer, MarkAttendanceSerializer
-from utils.sms import send_attendance_sms
+from .serializers import (
+    AttendanceSerializer,
+    MarkAttendanceSerializer,
+    BatchMarkAttendanceSerializer,
+    ScanSerializer,
+    parse_qr_data
+)
+from students.models import Student
+from utils.export import export_response, iter_rows
+from utils.pagination import KeysetPagination
+from utils.sms import queue_attendance_sms, bulk_queue_attendance_sms
+from utils.views import AsyncAPIView
 from accounts.permissions import IsOwnerOrTeacher
+from live.events import publish_attendance
 
 class AttendanceListView(generics.ListAPIView):
     serializer_class = AttendanceSerializer
     permission_classes = (IsOwnerOrTeacher,)
     
     def get_queryset(self):
-        queryset = Attendance.objects.all()
-        date = self.request.query_params.get('date', None)
-        class_id = self.request.query_params.get('class_id', None)
-        student_id = self.request.query_params.get('student_id', None)
-        
-        if date:
-            queryset = queryset.filter(date=date)
-        if class_id:
-            queryset = queryset.filter(class_attended_id=class_id)
-        if student_id:
-            queryset = queryset.filter(student_id=student_id)
-        
-        return queryset
+        return Attendance.objects.for_api().filter_params(self.request.query_params)
+
+class AttendanceExportView(APIView):
+    """Stream attendance as CSV, or XLSX with ``file_type=xlsx``."""
+    permission_classes = (IsOwnerOrTeacher,)
+    
+    columns = (
+        ('ID', 'id'),
+        ('Date', 'date'),
+        ('Time', 'time'),
+        ('Student ID', 'student_id'),
+        ('Student', 'student__full_name'),
+        ('Class ID', 'class_attended_id'),
+        ('Class', 'class_attended__name'),
+        ('Marked By', 'marked_by__username'),
+        ('SMS Sent', 'sms_sent'),
+    )
+    
+    def get(self, request):
+        queryset = Attendance.objects.filter_params(request.query_params)
+        header = [label for label, _ in self.columns]
+        rows = iter_rows(queryset, [field for _, field in self.columns])
+        return export_response(request.query_params.get('file_type'), header, rows, 'attendance')
+
+def record_attendance(student, user):
+    """Mark ``student`` present today and queue the parent's SMS, once per day."""
+    with transaction.atomic():
+        Student.objects.filter(pk=student.pk).lock()
+        attendance, created = Attendance.objects.get_or_create(
+            student=student,
+            class_attended=student.assigned_class,
+            date=timezone.now().date(),
+            defaults={'marked_by': user}
+        )
+        
+        if created:
+            queue_attendance_sms(attendance)
+    return attendance, created
 
 class MarkAttendanceView(APIView):
     permission_classes = (IsOwnerOrTeacher,)
@@ -42,13 +82,7 @@ class MarkAttendanceView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            today = timezone.now().date()
-            attendance, created = Attendance.objects.get_or_create(
-                student=student,
-                class_attended=student.assigned_class,
-                date=today,
-                defaults={'marked_by': request.user}
-            )
+            attendance, created = record_attendance(student, request.user)
             
             if not created:
                 return Response(
@@ -56,10 +90,6 @@ class MarkAttendanceView(APIView):
                     status=status.HTTP_200_OK
                 )
             
-            sms_sent = send_attendance_sms(student, student.assigned_class.name)
-            attendance.sms_sent = sms_sent
-            attendance.save()
-            
             return Response(
                 AttendanceSerializer(attendance).data, 
                 status=status.HTTP_201_CREATED
@@ -67,7 +97,149 @@ class MarkAttendanceView(APIView):
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class AsyncMarkAttendanceView(AsyncAPIView):
+    """``MarkAttendanceView`` as a native async view for the ASGI app.
+    
+    Takes the same JSON body and returns the same responses. Scans waiting
+    on the database queue on the event loop instead of each holding a
+    worker thread, so one process can keep hundreds in flight. Django 4.2
+    has no async transactions, so the insert and the SMS enqueue run
+    together in one ``sync_to_async`` call.
+    """
+    permission_classes = MarkAttendanceView.permission_classes
+    
+    async def post(self, request):
+        serializer = ScanSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            student_id = parse_qr_data(serializer.validated_data['qr_data'])
+        except serializers.ValidationError as e:
+            return Response({'qr_data': e.detail}, status=status.HTTP_400_BAD_REQUEST)
+        
+        student = await Student.objects.select_related('assigned_class').filter(pk=student_id).afirst()
+        if student is None:
+            return Response({'qr_data': ['Invalid student QR code']}, status=status.HTTP_400_BAD_REQUEST)
+        if not student.assigned_class:
+            return Response(
+                {'error': 'Student is not assigned to any class'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        attendance, created = await sync_to_async(record_attendance)(student, request.user)
+        if not created:
+            return Response({'message': 'Attendance already marked for today'}, status=status.HTTP_200_OK)
+        
+        return Response(AttendanceSerializer(attendance).data, status=status.HTTP_201_CREATED)
+
+class BatchMarkAttendanceView(APIView):
+    """Replay scans queued by a scanner while it was offline.
+    
+    Every scan gets a status of ``created``, ``duplicate``, ``invalid_qr``,
+    ``unknown_student`` or ``no_class``. The whole batch runs in a fixed
+    number of queries regardless of its size.
+    """
+    permission_classes = (IsOwnerOrTeacher,)
+    
+    def post(self, request):
+        serializer = BatchMarkAttendanceSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        scans = serializer.validated_data['scans']
+        
+        results = []
+        student_ids = []
+        for index, scan in enumerate(scans):
+            result = {'index': index, 'qr_data': scan['qr_data']}
+            try:
+                result['student_id'] = parse_qr_data(scan['qr_data'])
+                student_ids.append(result['student_id'])
+            except serializers.ValidationError as e:
+                result['status'] = 'invalid_qr'
+                result['error'] = e.detail[0]
+            results.append(result)
+        
+        students = Student.objects.select_related('assigned_class').in_bulk(student_ids)
+        now = timezone.localtime()
+        
+        pending = {}
+        existing = {}
+        for result, scan in zip(results, scans):
+            if 'status' in result:
+                continue
+            
+            student = students.get(result['student_id'])
+            if student is None:
+                result['status'] = 'unknown_student'
+                continue
+            if not student.assigned_class:
+                result['status'] = 'no_class'
+                continue
+            
+            scanned_at = timezone.localtime(scan.get('scanned_at', now))
+            key = (student.id, student.assigned_class_id, scanned_at.date())
+            result['key'] = key
+            if key not in pending:
+                pending[key] = Attendance(
+                    student=student,
+                    class_attended=student.assigned_class,
+                    date=key[2],
+                    time=scanned_at.time(),
+                    marked_by=request.user
+                )
+        
+        if pending:
+            dates = {key[2] for key in pending}
+            ids = {key[0] for key in pending}
+            
+            with transaction.atomic():
+                # Without the lock a scan marked concurrently between the
+                # lookup and the re-read below would be reported as created
+                # here and get a second SMS.
+                Student.objects.filter(id__in=ids).lock()
+                existing = {
+                    (row[1], row[2], row[3]): row[0]
+                    for row in Attendance.objects.filter(student_id__in=ids, date__in=dates)
+                    .values_list('id', 'student_id', 'class_attended_id', 'date')
+                }
+                new_rows = [a for key, a in pending.items() if key not in existing]
+                Attendance.objects.bulk_create(new_rows, ignore_conflicts=True)
+                
+                created = []
+                for row in Attendance.objects.filter(student_id__in=ids, date__in=dates).values_list(
+                    'id', 'student_id', 'class_attended_id', 'date'
+                ):
+                    key = (row[1], row[2], row[3])
+                    if key in pending and key not in existing:
+                        pending[key].pk = row[0]
+                        created.append(pending[key])
+                bulk_queue_attendance_sms(created)
+                publish_attendance(created)
+        
+        seen = set()
+        for result in results:
+            key = result.pop('key', None)
+            if key is None:
+                continue
+            if key in existing:
+                result['attendance_id'] = existing[key]
+                result['status'] = 'duplicate'
+            else:
+                result['attendance_id'] = pending[key].pk
+                created_here = pending[key].pk is not None and key not in seen
+                result['status'] = 'created' if created_here else 'duplicate'
+            seen.add(key)
+        
+        summary = {}
+        for result in results:
+            summary[result['status']] = summary.get(result['status'], 0) + 1
+        
+        return Response({'summary': summary, 'results': results}, status=status.HTTP_200_OK)
+
 class DailyReportView(APIView):
+    """Attendance totals for a day, grouped by class.
+    
+    Totals are aggregated in the database. The individual attendance rows are
+    only returned, one page at a time, when ``include_attendances=true``.
+    """
     permission_classes = (IsOwnerOrTeacher,)
     
     def get(self, request):
@@ -85,12 +257,48 @@ class DailyReportView(APIView):
         else:
             attendances = Attendance.objects.filter(date=date)
         
-        total_students = attendances.count()
-        total_income = sum([a.class_attended.fee_per_month / 30 for a in attendances])
+        classes = (
+            attendances.order_by()
+            .values('class_attended', 'class_attended__name')
+            .annotate(
+                total_students=Count('id'),
+                total_fees=Sum('class_attended__fee_per_month')
+            )
+            .order_by('class_attended__name')
+        )
+        
+        by_class = []
+        total_students = 0
+        total_income = Decimal('0')
+        for row in classes:
+            income = row['total_fees'] / 30
+            total_students += row['total_students']
+            total_income += income
+            by_class.append({
+                'class_id': row['class_attended'],
+                'class_name': row['class_attended__name'],
+                'total_students': row['total_students'],
+                'total_income': round(income, 2)
+            })
         
-        return Response({
+        report = {
             'date': date,
             'total_students': total_students,
             'total_income': round(total_income, 2),
-            'attendances': AttendanceSerializer(attendances, many=True).data
-        })
+            'classes': by_class
+        }
+        
+        if request.query_params.get('include_attendances') == 'true':
+            paginator = KeysetPagination()
+            paginator.opt_in = False
+            page = paginator.paginate_queryset(
+                attendances.for_api(),
+                request,
+                view=self
+            )
+            report['attendances'] = {
+                'next': paginator.get_next_link(),
+                'results': AttendanceSerializer(page, many=True).data
+            }
+        
+        return Response(report)
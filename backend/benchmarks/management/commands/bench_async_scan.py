@@ -0,0 +1,111 @@
+import asyncio
+import json
+import threading
+import time
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.client import AsyncClient
+from accounts.tokens import RoleRefreshToken
+from benchmarks.utils import create_fixture, isolated_database, run_concurrently, summarize
+
+class ThreadSampler:
+    """Record the most threads alive at once while the block runs."""
+    
+    def __enter__(self):
+        self.peak = threading.active_count()
+        self.running = True
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+        self.thread.start()
+        return self
+    
+    def sample(self):
+        while self.running:
+            self.peak = max(self.peak, threading.active_count())
+            time.sleep(0.005)
+    
+    def __exit__(self, *exc_info):
+        self.running = False
+        self.thread.join()
+
+class Command(BaseCommand):
+    help = (
+        'Compare the sync mark-attendance view, driven from a pool of threads '
+        'as under WSGI, with the async view driven from one event loop as '
+        'under ASGI. Reports latency, throughput and the peak thread count.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--scans', type=int, default=500, help='Scans per mode.')
+        parser.add_argument('--threads', type=int, default=8, help='Worker threads for the sync view.')
+        parser.add_argument('--concurrency', type=int, default=200, help='Scans in flight for the async view.')
+    
+    def handle(self, *args, **options):
+        scans = options['scans']
+        with isolated_database():
+            owner, teacher, classes, students = create_fixture(students=scans * 2)
+            token = str(RoleRefreshToken.for_user(teacher).access_token)
+            # Each mode scans its own students, so every scan inserts.
+            payloads = [f'STUDENT:{s.id}:{s.full_name}' for s in students]
+            
+            sync = self.run_sync(token, payloads[:scans], options['threads'])
+            sync['threads'] = options['threads']
+            run_async = async_to_sync(self.run_async)
+            with ThreadSampler() as sampler:
+                result = run_async(token, payloads[scans:], options['concurrency'])
+            result['concurrency'] = options['concurrency']
+            result['peak_threads'] = sampler.peak
+            
+            report = {
+                'benchmark': 'async_scan',
+                'engine': connection.settings_dict['ENGINE'],
+                'sync_view': sync,
+                'async_view': result,
+            }
+        
+        self.stdout.write(json.dumps(report, indent=2))
+    
+    def run_sync(self, token, payloads, threads):
+        def scan(qr_data):
+            client = Client(raise_request_exception=False, headers={'Authorization': f'Bearer {token}'})
+            response = client.post('/api/attendance/mark/', {'qr_data': qr_data}, content_type='application/json')
+            return response.status_code in (200, 201)
+        
+        with ThreadSampler() as sampler:
+            latencies, errors, elapsed = run_concurrently(scan, payloads, threads)
+        result = summarize(latencies, elapsed, errors)
+        result['peak_threads'] = sampler.peak
+        if errors:
+            result['sample_errors'] = sorted(set(errors))[:5]
+        return result
+    
+    async def run_async(self, token, payloads, concurrency):
+        client = AsyncClient(raise_request_exception=False)
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies, errors = [], []
+        
+        async def scan(qr_data):
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await client.post(
+                        '/api/attendance/mark/async/',
+                        {'qr_data': qr_data},
+                        content_type='application/json',
+                        headers={'Authorization': f'Bearer {token}'}
+                    )
+                except Exception as e:
+                    errors.append(repr(e))
+                    return
+                if response.status_code in (200, 201):
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors.append(f'status {response.status_code}')
+        
+        started = time.perf_counter()
+        await asyncio.gather(*(scan(qr_data) for qr_data in payloads))
+        result = summarize(latencies, time.perf_counter() - started, errors)
+        if errors:
+            result['sample_errors'] = sorted(set(errors))[:5]
+        return result
@@ -0,0 +1,146 @@
+import datetime
+import json
+import re
+import shutil
+import statistics
+import tempfile
+from pathlib import Path
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from accounts.models import User
+from accounts.tokens import RoleRefreshToken
+from benchmarks.seed import MONTHS, seed_dataset
+from benchmarks.utils import isolated_database, run_concurrently, summarize
+from students.models import Student
+
+DB_TIMING = re.compile(r'db;dur=([\d.]+);desc="(\d+) call')
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway database and drive the main endpoints concurrently. '
+        'Reports p50/p95/p99 latency, throughput and SQL query counts per '
+        'endpoint as JSON; --output saves a baseline and --compare diffs one.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=1000)
+        parser.add_argument('--classes', type=int, default=20)
+        parser.add_argument('--teachers', type=int, default=5)
+        parser.add_argument('--years', type=int, default=1)
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint.')
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--only', help='Comma-separated endpoint names to run.')
+        parser.add_argument('--output', help='Write the report to this file.')
+        parser.add_argument('--compare', help='Baseline report to compare p95 latency against.')
+    
+    def handle(self, *args, **options):
+        media = tempfile.mkdtemp(prefix='tuition-bench-media-')
+        media_settings = override_settings(MEDIA_ROOT=media, QR_CODE_DIR=Path(media) / 'qr_codes')
+        (Path(media) / 'qr_codes').mkdir()
+        
+        try:
+            with media_settings, isolated_database():
+                dataset = seed_dataset(
+                    teachers=options['teachers'],
+                    classes=options['classes'],
+                    students=options['students'],
+                    years=options['years']
+                )
+                endpoints = self.endpoints(options['requests'])
+                if options['only']:
+                    wanted = set(options['only'].split(','))
+                    endpoints = [e for e in endpoints if e[0] in wanted]
+                
+                results = {}
+                for name, user, method, requests in endpoints:
+                    self.stderr.write(f'{name}: {len(requests)} request(s)')
+                    results[name] = self.run(user, method, requests, options['threads'])
+        finally:
+            shutil.rmtree(media, ignore_errors=True)
+        
+        report = {
+            'benchmark': 'endpoints',
+            'engine': connection.settings_dict['ENGINE'],
+            'threads': options['threads'],
+            'dataset': dataset,
+            'endpoints': results,
+        }
+        if options['compare']:
+            report['compare'] = self.compare(results, options['compare'])
+        
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            Path(options['output']).write_text(output + '\n')
+        self.stdout.write(output)
+    
+    def endpoints(self, count):
+        """``(name, user, method, [(url, data), ...])`` for every scenario."""
+        owner = User.objects.get(username='seed-owner')
+        teacher = User.objects.get(username='seed-teacher-1')
+        today = timezone.localdate()
+        yesterday = today - datetime.timedelta(days=1)
+        last_month = today.replace(day=1) - datetime.timedelta(days=1)
+        month, year = MONTHS[last_month.month - 1], last_month.year
+        
+        # Scanning students that have not been marked today, so every scan inserts.
+        students = Student.objects.filter(assigned_class__isnull=False).order_by('id')[:count]
+        scans = [('/api/attendance/mark/', {'qr_data': f'STUDENT:{s.id}:{s.full_name}'}) for s in students]
+        
+        def repeat(url):
+            return [(url, None)] * count
+        
+        return [
+            ('mark-attendance', teacher, 'post', scans),
+            ('daily-report', teacher, 'get', repeat('/api/attendance/daily-report/')),
+            ('attendance-list', owner, 'get', repeat(f'/api/attendance/?date={yesterday}')),
+            ('monthly-income', owner, 'get', repeat(f'/api/payments/monthly-income/?month={month}&year={year}')),
+            ('outstanding-payments', owner, 'get', repeat('/api/payments/outstanding/?page_size=50')),
+            ('payment-list', owner, 'get', repeat('/api/payments/?status=overdue&page_size=50')),
+            ('student-list', owner, 'get', repeat('/api/students/?page_size=50')),
+            ('class-list', teacher, 'get', repeat('/api/classes/')),
+        ]
+    
+    def run(self, user, method, requests, threads):
+        token = str(RoleRefreshToken.for_user(user).access_token)
+        queries, db_ms = [], []
+        
+        def call(request):
+            url, data = request
+            client = APIClient(raise_request_exception=False)
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+            response = getattr(client, method)(url, data, format='json') if data else getattr(client, method)(url)
+            match = DB_TIMING.search(response.get('Server-Timing', ''))
+            queries.append(int(match.group(2)) if match else 0)
+            db_ms.append(float(match.group(1)) if match else 0.0)
+            return response.status_code < 400
+        
+        if method == 'get':
+            # Warm up first so one-off work (QR images on a first read) is not timed.
+            call(requests[0])
+            queries.clear()
+            db_ms.clear()
+        
+        latencies, errors, elapsed = run_concurrently(call, requests, threads)
+        result = summarize(latencies, elapsed, errors)
+        result['queries_mean'] = round(statistics.mean(queries), 1) if queries else None
+        result['queries_max'] = max(queries, default=None)
+        result['db_ms_mean'] = round(statistics.mean(db_ms), 2) if db_ms else None
+        if errors:
+            result['sample_errors'] = sorted(set(errors))[:5]
+        return result
+    
+    def compare(self, results, path):
+        baseline = json.loads(Path(path).read_text())['endpoints']
+        changes = {}
+        for name, result in results.items():
+            before = baseline.get(name, {}).get('p95_ms')
+            if before and result['p95_ms'] is not None:
+                changes[name] = {
+                    'p95_ms_before': before,
+                    'p95_ms_after': result['p95_ms'],
+                    'p95_change_pct': round((result['p95_ms'] - before) / before * 100, 1),
+                }
+        return changes
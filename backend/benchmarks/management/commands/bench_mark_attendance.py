@@ -0,0 +1,40 @@
+import json
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework.test import APIClient
+from benchmarks.utils import create_fixture, isolated_database, run_concurrently, summarize
+
+class Command(BaseCommand):
+    help = (
+        'Measure concurrent mark-attendance throughput against a throwaway copy of '
+        'the configured database. Run once per mode to compare, e.g. with '
+        'SQLITE_TUNED=false, SQLITE_TUNED=true and a postgres DATABASE_URL.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--scans', type=int, default=500, help='Total scans to submit.')
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent scanner threads.')
+    
+    def handle(self, *args, **options):
+        with isolated_database():
+            owner, teacher, classes, students = create_fixture(students=options['scans'])
+            payloads = [f'STUDENT:{s.id}:{s.full_name}' for s in students]
+            
+            def scan(qr_data):
+                client = APIClient(raise_request_exception=False)
+                client.force_authenticate(teacher)
+                response = client.post('/api/attendance/mark/', {'qr_data': qr_data}, format='json')
+                return response.status_code in (200, 201)
+            
+            latencies, errors, elapsed = run_concurrently(scan, payloads, options['threads'])
+            
+            result = {
+                'benchmark': 'mark_attendance',
+                'engine': connection.settings_dict['ENGINE'],
+                'threads': options['threads'],
+                **summarize(latencies, elapsed, errors),
+            }
+            if errors:
+                result['sample_errors'] = sorted(set(errors))[:5]
+        
+        self.stdout.write(json.dumps(result, indent=2))
@@ -0,0 +1,134 @@
+import datetime
+import json
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count
+from attendance.models import Attendance
+from payments.models import Payment
+from benchmarks.utils import create_fixture, isolated_database
+
+MONTHS = [choice for choice, _ in Payment.MONTH_CHOICES]
+
+class Command(BaseCommand):
+    help = (
+        'Load a large attendance/payment fixture into a throwaway database and '
+        'report the query plan and latency of every list/report filter path.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help='Attendance rows to create.')
+        parser.add_argument('--students', type=int, default=2000)
+        parser.add_argument('--classes', type=int, default=40)
+        parser.add_argument('--payment-years', type=int, default=2)
+        parser.add_argument('--batch-size', type=int, default=5000)
+    
+    def handle(self, *args, **options):
+        with isolated_database():
+            start = time.perf_counter()
+            owner, teacher, classes, students = create_fixture(
+                students=options['students'],
+                classes=options['classes']
+            )
+            self.load_attendance(students, teacher, options['rows'], options['batch_size'])
+            self.load_payments(students, owner, options['payment_years'], options['batch_size'])
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+            load_time = time.perf_counter() - start
+            
+            day = datetime.date(2024, 1, 1)
+            student, klass = students[0], classes[0]
+            year = day.year
+            checks = [
+                ('attendance-list date', ['attendance_date'],
+                 Attendance.objects.filter(date=day)),
+                ('attendance-list class_id', ['attendance_class_date_idx'],
+                 Attendance.objects.filter(class_attended_id=klass.id)),
+                ('attendance-list student_id', ['attendance_student_date_idx'],
+                 Attendance.objects.filter(student_id=student.id)),
+                ('daily-report teacher', ['attendance_date_class_idx'],
+                 Attendance.objects.filter(date=day, class_attended__teacher=teacher)
+                 .order_by().values('class_attended').annotate(total=Count('id'))),
+                ('payment-list student_id+status', ['payment_student_status_idx', 'uniq', 'autoindex'],
+                 Payment.objects.filter(student_id=student.id, status='paid')),
+                ('payment-list status', ['payment_status_year_idx', 'payment_outstanding_idx'],
+                 Payment.objects.filter(status='pending')),
+                ('monthly-income month+year+status', ['payment_period_status_idx'],
+                 Payment.objects.filter(month='january', year=year, status='paid')),
+                ('outstanding-payments', ['payment_outstanding_idx'],
+                 Payment.objects.outstanding()),
+            ]
+            
+            results = []
+            for name, expected, queryset in checks:
+                plan = queryset.explain()
+                started = time.perf_counter()
+                list(queryset[:50])
+                elapsed = time.perf_counter() - started
+                results.append({
+                    'query': name,
+                    'uses_expected_index': any(index in plan for index in expected),
+                    'first_page_ms': round(elapsed * 1000, 2),
+                    'plan': plan.splitlines(),
+                })
+            
+            report = {
+                'benchmark': 'query_plans',
+                'engine': connection.settings_dict['ENGINE'],
+                'attendance_rows': Attendance.objects.count(),
+                'payment_rows': Payment.objects.count(),
+                'load_s': round(load_time, 1),
+                'queries': results,
+            }
+        
+        self.stdout.write(json.dumps(report, indent=2))
+    
+    def load_attendance(self, students, teacher, rows, batch_size):
+        days = -(-rows // len(students))
+        first_day = datetime.date(2024, 1, 1)
+        batch = []
+        created = 0
+        for offset in range(days):
+            day = first_day + datetime.timedelta(days=offset)
+            for student in students:
+                if created == rows:
+                    break
+                batch.append(Attendance(
+                    student_id=student.id,
+                    class_attended_id=student.assigned_class_id,
+                    date=day,
+                    time=datetime.time(16, created % 60),
+                    marked_by=teacher
+                ))
+                created += 1
+                if len(batch) == batch_size:
+                    self.insert(Attendance, batch)
+                    batch = []
+        if batch:
+            self.insert(Attendance, batch)
+    
+    def load_payments(self, students, owner, years, batch_size):
+        batch = []
+        statuses = ['paid', 'paid', 'paid', 'pending', 'overdue']
+        for year in range(2024, 2024 + years):
+            for month_index, month in enumerate(MONTHS):
+                for student in students:
+                    status = statuses[(student.id + month_index) % len(statuses)]
+                    batch.append(Payment(
+                        student_id=student.id,
+                        class_fee_id=student.assigned_class_id,
+                        month=month,
+                        year=year,
+                        amount=3000,
+                        status=status,
+                        received_by=owner if status == 'paid' else None
+                    ))
+                    if len(batch) == batch_size:
+                        self.insert(Payment, batch)
+                        batch = []
+        if batch:
+            self.insert(Payment, batch)
+    
+    def insert(self, model, batch):
+        with transaction.atomic():
+            model.objects.bulk_create(batch, batch_size=500)
@@ -0,0 +1,69 @@
+import json
+import time
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.test import APIClient
+from benchmarks.utils import create_fixture, isolated_database, run_concurrently, summarize
+from utils.sms import attendance_message, deliver_sms
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the mark-attendance hot path against a simulated SMS gateway. '
+        'Compares queueing the SMS in the outbox with sending it inline, and '
+        'times draining the outbox with process_outbox.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--scans', type=int, default=200)
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent scanner threads.')
+        parser.add_argument('--latency', type=float, default=0.3, help='Simulated gateway delay in seconds.')
+        parser.add_argument('--jitter', type=float, default=0.0)
+        parser.add_argument('--workers', type=int, default=8, help='process_outbox delivery threads.')
+    
+    def handle(self, *args, **options):
+        sms_settings = override_settings(
+            SMS_BACKEND='utils.sms.backends.latency.SmsBackend',
+            SMS_SIMULATED_LATENCY=options['latency'],
+            SMS_SIMULATED_JITTER=options['jitter']
+        )
+        
+        report = {
+            'benchmark': 'sms_hot_path',
+            'gateway_latency_s': options['latency'],
+            'threads': options['threads'],
+        }
+        with sms_settings:
+            for mode in ('outbox', 'inline'):
+                with isolated_database():
+                    report[mode] = self.run_scans(mode, options)
+                    if mode == 'outbox':
+                        started = time.perf_counter()
+                        call_command(
+                            'process_outbox', workers=options['workers'], window=0, stdout=StringIO()
+                        )
+                        report['outbox_drain'] = {
+                            'messages': options['scans'],
+                            'workers': options['workers'],
+                            'elapsed_s': round(time.perf_counter() - started, 3),
+                        }
+        
+        self.stdout.write(json.dumps(report, indent=2))
+    
+    def run_scans(self, mode, options):
+        owner, teacher, classes, students = create_fixture(students=options['scans'])
+        by_payload = {f'STUDENT:{s.id}:{s.full_name}': s for s in students}
+        
+        def scan(qr_data):
+            client = APIClient(raise_request_exception=False)
+            client.force_authenticate(teacher)
+            response = client.post('/api/attendance/mark/', {'qr_data': qr_data}, format='json')
+            if mode == 'inline':
+                # What the view used to do: wait for the gateway before replying.
+                student = by_payload[qr_data]
+                deliver_sms(student.parent_phone, attendance_message(student, classes[0].name))
+            return response.status_code in (200, 201)
+        
+        latencies, errors, elapsed = run_concurrently(scan, list(by_payload), options['threads'])
+        return summarize(latencies, elapsed, errors)
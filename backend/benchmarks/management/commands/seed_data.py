@@ -0,0 +1,41 @@
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+from accounts.models import User
+from benchmarks.seed import PASSWORD, seed_dataset
+
+class Command(BaseCommand):
+    help = (
+        'Fill the configured database with synthetic teachers, classes, students '
+        'and years of attendance and payments, using bulk inserts.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--teachers', type=int, default=10)
+        parser.add_argument('--classes', type=int, default=40)
+        parser.add_argument('--students', type=int, default=2000)
+        parser.add_argument('--years', type=int, default=2, help='Years of attendance and payment history.')
+        parser.add_argument('--attendance-rate', type=float, default=0.9, help='Share of sessions attended.')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed, for repeatable data sets.')
+        parser.add_argument('--batch-size', type=int, default=5000)
+    
+    def handle(self, *args, **options):
+        if User.objects.filter(username='seed-owner').exists():
+            raise CommandError('This database has already been seeded.')
+        
+        started = time.perf_counter()
+        counts = seed_dataset(
+            teachers=options['teachers'],
+            classes=options['classes'],
+            students=options['students'],
+            years=options['years'],
+            attendance_rate=options['attendance_rate'],
+            seed=options['seed'],
+            batch_size=options['batch_size']
+        )
+        counts['elapsed_s'] = round(time.perf_counter() - started, 1)
+        
+        self.stdout.write(json.dumps(counts, indent=2))
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded. Log in as seed-owner or seed-teacher-1 with the password '{PASSWORD}'."
+        ))
@@ -0,0 +1,152 @@
+import datetime
+import random
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+from accounts.models import User
+from attendance.models import Attendance
+from classes.models import Class
+from payments.models import MonthlyIncome, Payment
+from students.models import Student
+from students.qr import qr_storage_name
+from utils.cache import invalidate_models
+
+MONTHS = [choice for choice, _ in Payment.MONTH_CHOICES]
+SUBJECTS = ['Mathematics', 'Science', 'English', 'Sinhala', 'ICT', 'Commerce', 'History', 'Tamil']
+DAY_NAMES = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+# Weekdays (Monday is 0) each class meets on, assigned round-robin.
+SCHEDULES = [(0, 2), (1, 3), (2, 4), (3, 0), (4, 1), (5, 6)]
+PASSWORD = 'seed-password'
+
+def _insert(model, rows, batch_size):
+    with transaction.atomic():
+        return model.objects.bulk_create(rows, batch_size=batch_size)
+
+def _insert_stream(model, rows, batch_size):
+    batch, count = [], 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            _insert(model, batch, batch_size)
+            count += len(batch)
+            batch = []
+    if batch:
+        _insert(model, batch, batch_size)
+        count += len(batch)
+    return count
+
+def _months_between(start, end):
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+def seed_dataset(teachers=10, classes=40, students=2000, years=2, attendance_rate=0.9,
+                 today=None, seed=1, batch_size=5000):
+    """Bulk-insert a production-sized data set and return row counts.
+    
+    Users are named ``seed-owner`` and ``seed-teacher-N``, with the password
+    ``PASSWORD``. Attendance covers each class's two weekly sessions over the
+    last ``years`` years. Payments cover every month in that span; old months
+    are mostly paid and the current month is pending. Model signals do not
+    run, so the income rollup is rebuilt at the end.
+    """
+    rng = random.Random(seed)
+    today = today or timezone.localdate()
+    first_day = today - datetime.timedelta(days=365 * years)
+    password = make_password(PASSWORD)
+    
+    owner = _insert(User, [User(username='seed-owner', role='owner', password=password)], batch_size)[0]
+    teacher_list = _insert(User, [
+        User(username=f'seed-teacher-{i + 1}', first_name='Teacher', last_name=str(i + 1),
+             role='teacher', password=password)
+        for i in range(teachers)
+    ], batch_size)
+    
+    class_list = []
+    for i in range(classes):
+        days = SCHEDULES[i % len(SCHEDULES)]
+        class_list.append(Class(
+            name=f'Grade {6 + i % 8} {SUBJECTS[i % len(SUBJECTS)]} {i // len(SUBJECTS) + 1}',
+            subject=SUBJECTS[i % len(SUBJECTS)],
+            teacher=teacher_list[i % teachers],
+            fee_per_month=Decimal(2000 + 500 * (i % 5)),
+            schedule='/'.join(DAY_NAMES[d] for d in days) + ' 4-6 PM'
+        ))
+    class_list = _insert(Class, class_list, batch_size)
+    class_days = {klass.id: SCHEDULES[i % len(SCHEDULES)] for i, klass in enumerate(class_list)}
+    
+    student_list = _insert(Student, [
+        Student(
+            full_name=f'Student {i + 1}',
+            date_of_birth=datetime.date(2008 + i % 8, i % 12 + 1, i % 28 + 1),
+            parent_name=f'Parent {i + 1}',
+            parent_phone=f'+9477{i:07d}',
+            address='Colombo',
+            assigned_class=class_list[i % classes],
+            is_active=rng.random() > 0.05
+        )
+        for i in range(students)
+    ], batch_size)
+    for student in student_list:
+        student.qr_code.name = qr_storage_name(student)
+    with transaction.atomic():
+        Student.objects.bulk_update(student_list, ['qr_code'], batch_size=500)
+    
+    roster = {}
+    for student in student_list:
+        roster.setdefault(student.assigned_class_id, []).append(student.id)
+    teacher_of = {klass.id: klass.teacher_id for klass in class_list}
+    
+    def attendance_rows():
+        day = first_day
+        while day < today:
+            for class_id, days in class_days.items():
+                if day.weekday() not in days:
+                    continue
+                for student_id in roster.get(class_id, ()):
+                    if rng.random() < attendance_rate:
+                        yield Attendance(
+                            student_id=student_id,
+                            class_attended_id=class_id,
+                            date=day,
+                            time=datetime.time(15, 45 + rng.randrange(15), rng.randrange(60)),
+                            marked_by_id=teacher_of[class_id]
+                        )
+            day += datetime.timedelta(days=1)
+    
+    fees = {klass.id: klass.fee_per_month for klass in class_list}
+    
+    def payment_rows():
+        for year, month in _months_between(first_day, today):
+            current = (year, month) == (today.year, today.month)
+            for student in student_list:
+                roll = rng.random()
+                status = 'pending' if current or roll < 0.03 else 'overdue' if roll < 0.06 else 'paid'
+                yield Payment(
+                    student_id=student.id,
+                    class_fee_id=student.assigned_class_id,
+                    month=MONTHS[month - 1],
+                    year=year,
+                    amount=fees[student.assigned_class_id],
+                    status=status,
+                    payment_date=datetime.date(year, month, rng.randrange(1, 28)) if status == 'paid' else None,
+                    received_by=owner if status == 'paid' else None
+                )
+    
+    attendance_count = _insert_stream(Attendance, attendance_rows(), batch_size)
+    payment_count = _insert_stream(Payment, payment_rows(), batch_size)
+    call_command('rebuild_income_rollup', stdout=StringIO())
+    invalidate_models(User, Class, Student, Payment, MonthlyIncome)
+    
+    return {
+        'teachers': len(teacher_list),
+        'classes': len(class_list),
+        'students': len(student_list),
+        'attendance': attendance_count,
+        'payments': payment_count,
+        'first_day': first_day.isoformat(),
+    }
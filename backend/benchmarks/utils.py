@@ -0,0 +1,130 @@
+import datetime
+import os
+import queue
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from django.db import connection, connections
+from accounts.models import User
+from classes.models import Class
+from students.models import Student
+
+@contextmanager
+def isolated_database(keep=False):
+    """Run the block against a throwaway copy of the configured database.
+    
+    SQLite gets a file-backed database rather than Django's in-memory test
+    database, so journaling and locking behave as they do in production.
+    """
+    settings_dict = connection.settings_dict
+    tmpdir = None
+    if connection.vendor == 'sqlite':
+        tmpdir = tempfile.mkdtemp(prefix='tuition-bench-')
+        settings_dict.setdefault('TEST', {})['NAME'] = os.path.join(tmpdir, 'bench.sqlite3')
+    
+    old_name = settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=False)
+    try:
+        yield
+    finally:
+        connections.close_all()
+        if not keep:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+        if tmpdir and not keep:
+            for name in os.listdir(tmpdir):
+                os.unlink(os.path.join(tmpdir, name))
+            os.rmdir(tmpdir)
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def summarize(latencies, elapsed, errors=()):
+    """Latency percentiles in milliseconds plus throughput for a run."""
+    errors = len(errors)
+    return {
+        'requests': len(latencies) + errors,
+        'errors': errors,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round((len(latencies) + errors) / elapsed, 1) if elapsed else None,
+        'mean_ms': round(statistics.mean(latencies) * 1000, 2) if latencies else None,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2) if latencies else None,
+    }
+
+def run_concurrently(func, items, workers):
+    """Call ``func(item)`` for every item from ``workers`` threads.
+    
+    ``func`` returns a truthy value on success. Returns ``(latencies, errors,
+    elapsed)`` where ``errors`` lists the failures. Each thread closes its
+    own database connection when it runs out of work.
+    """
+    pending = queue.SimpleQueue()
+    for item in items:
+        pending.put(item)
+    
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    
+    def worker():
+        try:
+            while True:
+                try:
+                    item = pending.get_nowait()
+                except queue.Empty:
+                    return
+                start = time.perf_counter()
+                try:
+                    ok, error = bool(func(item)), 'unsuccessful response'
+                except Exception as e:
+                    ok, error = False, repr(e)
+                duration = time.perf_counter() - start
+                with lock:
+                    if ok:
+                        latencies.append(duration)
+                    else:
+                        errors.append(error)
+        finally:
+            connection.close()
+    
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors, time.perf_counter() - start
+
+def create_fixture(students=100, classes=1):
+    """Minimal owner/teacher/classes/students set used by the benchmarks."""
+    owner = User.objects.create_user('bench-owner', password='bench', role='owner')
+    teacher = User.objects.create_user('bench-teacher', password='bench', role='teacher')
+    class_list = [
+        Class.objects.create(
+            name=f'Bench class {i + 1}',
+            subject='Mathematics',
+            teacher=teacher,
+            fee_per_month=3000,
+            schedule='Mon/Wed 4-6 PM'
+        )
+        for i in range(classes)
+    ]
+    student_list = Student.objects.bulk_create([
+        Student(
+            full_name=f'Bench student {i + 1}',
+            date_of_birth=datetime.date(2012, 1, 1),
+            parent_name='Parent',
+            parent_phone=f'+9477{i:07d}',
+            address='Colombo',
+            assigned_class=class_list[i % classes]
+        )
+        for i in range(students)
+    ])
+    return owner, teacher, class_list, student_list
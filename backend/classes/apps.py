@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ClassesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'classes'
+    
+    def ready(self):
+        from utils.cache import watch_model
+        watch_model(self.get_model('Class'))
@@ -1,6 +1,10 @@
 from django.db import models
 from django.conf import settings
 
+class ClassQuerySet(models.QuerySet):
+    def for_api(self):
+        return self.select_related('teacher').annotate(student_count=models.Count('students'))
+
 class Class(models.Model):
     name = models.CharField(max_length=100)
     subject = models.CharField(max_length=100)
@@ -16,6 +20,8 @@ class Class(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ClassQuerySet.as_manager()
+    
     class Meta:
         verbose_name_plural = "Classes"
     
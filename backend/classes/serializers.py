@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from .models import Class
+from utils.serializers import DynamicFieldsMixin
 
-class ClassSerializer(serializers.ModelSerializer):
+class ClassSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     teacher_name = serializers.CharField(source='teacher.get_full_name', read_only=True)
     student_count = serializers.SerializerMethodField()
     
@@ -12,4 +13,7 @@ class ClassSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
     
     def get_student_count(self, obj):
+        # Annotated by Class.objects.for_api(); fall back for fresh instances.
+        if hasattr(obj, 'student_count'):
+            return obj.student_count
         return obj.students.count()
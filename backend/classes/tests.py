@@ -1,3 +1,31 @@
-from django.test import TestCase
+from utils.testing import ListQueryCountTestCase
 
-# Create your tests here.
+class ClassListQueryCountTests(ListQueryCountTestCase):
+    def add_classes(self, count):
+        for _ in range(count):
+            self.create_students(2, self.create_class())
+    
+    def test_list_query_count_is_constant(self):
+        self.assertConstantQueries('/api/classes/', self.add_classes)
+
+class ClassListCacheTests(ListQueryCountTestCase):
+    def test_repeat_requests_are_served_from_cache_with_etag(self):
+        self.create_students(2)
+        first = self.client.get('/api/classes/')
+        self.assertEqual(self.count_queries('/api/classes/'), 0)
+        
+        response = self.client.get('/api/classes/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+    
+    def test_writes_to_dependent_models_invalidate(self):
+        self.create_students(1)
+        etag = self.client.get('/api/classes/')['ETag']
+        
+        self.create_students(1, self.create_class())
+        response = self.client.get('/api/classes/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 2)
+        
+        self.teacher.first_name = 'Nimal'
+        self.teacher.save()
+        self.assertEqual(self.client.get('/api/classes/').data[0]['teacher_name'], 'Nimal')
@@ -1,11 +1,16 @@
 from rest_framework import generics, permissions
 from .models import Class
 from .serializers import ClassSerializer
+from accounts.models import User
 from accounts.permissions import IsOwner, IsOwnerOrTeacher
+from students.models import Student
+from utils.cache import CachedResponseMixin
 
-class ClassListCreateView(generics.ListCreateAPIView):
-    queryset = Class.objects.all()
+class ClassListCreateView(CachedResponseMixin, generics.ListCreateAPIView):
+    queryset = Class.objects.for_api()
     serializer_class = ClassSerializer
+    pagination_ordering = ['id']
+    cache_models = (Class, Student, User)
     
     def get_permissions(self):
         if self.request.method == 'POST':
@@ -13,7 +18,7 @@ class ClassListCreateView(generics.ListCreateAPIView):
         return [IsOwnerOrTeacher()]
 
 class ClassDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Class.objects.all()
+    queryset = Class.objects.for_api()
     serializer_class = ClassSerializer
     
     def get_permissions(self):
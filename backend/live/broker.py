@@ -0,0 +1,100 @@
+import asyncio
+import threading
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+RESYNC = {'type': 'resync'}
+
+class Subscription:
+    """One dashboard connection's bounded event buffer.
+    
+    Must be created on the event loop that reads it; ``deliver`` may be
+    called from any thread. A client that falls ``maxsize`` events behind
+    loses its backlog and gets a single ``resync`` event instead, telling it
+    to reload its totals.
+    """
+    
+    def __init__(self, broker, accept, maxsize):
+        self.broker = broker
+        self.accept = accept
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+    
+    def deliver(self, event):
+        self.loop.call_soon_threadsafe(self._put, event)
+    
+    def _put(self, event):
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = RESYNC
+        self.queue.put_nowait(event)
+    
+    async def get(self):
+        return await self.queue.get()
+    
+    def close(self):
+        self.broker.unsubscribe(self)
+
+class BaseBroker:
+    """Fans published events out to subscriptions.
+    
+    Backends that share events between processes hand each event they
+    receive to ``Subscription.deliver`` for their local subscribers.
+    """
+    
+    def subscribe(self, accept=None):
+        raise NotImplementedError
+    
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+    
+    def publish(self, event):
+        raise NotImplementedError
+    
+    def has_subscribers(self):
+        """Whether publishing could reach anyone; lets callers skip building events."""
+        return True
+
+class LocalBroker(BaseBroker):
+    """In-process broker; only reaches connections served by this process."""
+    
+    def __init__(self, buffer_size=None):
+        self.buffer_size = buffer_size or settings.LIVE_FEED_BUFFER
+        self.lock = threading.Lock()
+        self.subscriptions = set()
+    
+    def subscribe(self, accept=None):
+        subscription = Subscription(self, accept, self.buffer_size)
+        with self.lock:
+            self.subscriptions.add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscriptions.discard(subscription)
+    
+    def publish(self, event):
+        with self.lock:
+            subscriptions = list(self.subscriptions)
+        for subscription in subscriptions:
+            if subscription.accept is not None and not subscription.accept(event):
+                continue
+            try:
+                subscription.deliver(event)
+            except RuntimeError:
+                # The connection's event loop is closed.
+                self.unsubscribe(subscription)
+    
+    def has_subscribers(self):
+        return bool(self.subscriptions)
+
+_broker = None
+_lock = threading.Lock()
+
+def get_broker():
+    global _broker
+    with _lock:
+        if _broker is None:
+            _broker = import_string(settings.LIVE_FEED_BACKEND)()
+        return _broker
@@ -0,0 +1,57 @@
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from .broker import get_broker
+
+def attendance_event(attendance):
+    return {
+        'type': 'attendance',
+        'id': attendance.id,
+        'student_id': attendance.student_id,
+        'student_name': attendance.student.full_name,
+        'class_id': attendance.class_attended_id,
+        'class_name': attendance.class_attended.name,
+        'teacher_id': attendance.class_attended.teacher_id,
+        'date': attendance.date,
+        'time': attendance.time,
+    }
+
+def attendance_events(attendances):
+    """Build events for ``attendances``, fetching only students and classes not already loaded."""
+    prefetch_related_objects(attendances, 'student', 'class_attended')
+    return [attendance_event(a) for a in attendances]
+
+def payment_event(payment, previous_status=None):
+    prefetch_related_objects([payment], 'student', 'class_fee')
+    return {
+        'type': 'payment',
+        'id': payment.id,
+        'student_id': payment.student_id,
+        'student_name': payment.student.full_name,
+        'class_id': payment.class_fee_id,
+        'class_name': payment.class_fee.name,
+        'teacher_id': payment.class_fee.teacher_id,
+        'amount': payment.amount,
+        'month': payment.month,
+        'year': payment.year,
+        'payment_date': payment.payment_date,
+        'previous_status': previous_status,
+    }
+
+def publish_on_commit(build, *args):
+    """Publish ``build(*args)`` once the current transaction commits.
+    
+    Nothing is built when no dashboard is connected.
+    """
+    if not get_broker().has_subscribers():
+        return
+    
+    def publish():
+        broker = get_broker()
+        for event in build(*args):
+            broker.publish(event)
+    
+    transaction.on_commit(publish)
+
+def publish_attendance(attendances):
+    """Announce attendance rows created without ``save()``, e.g. by ``bulk_create``."""
+    publish_on_commit(attendance_events, list(attendances))
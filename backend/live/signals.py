@@ -0,0 +1,16 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from attendance.models import Attendance
+from payments.models import Payment
+from payments.signals import status_changed
+from .events import attendance_events, payment_event, publish_on_commit
+
+@receiver(post_save, sender=Attendance)
+def publish_new_attendance(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        publish_on_commit(attendance_events, [instance])
+
+@receiver(status_changed, sender=Payment)
+def publish_paid_payment(sender, instance, previous, **kwargs):
+    if instance.status == 'paid':
+        publish_on_commit(lambda p: [payment_event(p, previous)], instance)
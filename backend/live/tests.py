@@ -0,0 +1,155 @@
+import asyncio
+import json
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import SimpleTestCase, override_settings
+from django.test.client import AsyncClient
+from accounts.models import User
+from attendance.models import Attendance
+from payments.models import Payment
+from utils.testing import APIFixtureTestCase
+from .broker import RESYNC, LocalBroker, get_broker
+from .events import attendance_events
+
+class LocalBrokerTests(SimpleTestCase):
+    def test_subscriber_that_falls_behind_gets_resync_instead_of_backlog(self):
+        async def scenario():
+            broker = LocalBroker(buffer_size=3)
+            everything = broker.subscribe()
+            filtered = broker.subscribe(lambda event: event['teacher_id'] == 2)
+            for i in range(5):
+                broker.publish({'type': 'attendance', 'id': i, 'teacher_id': 1 if i < 4 else 2})
+            await asyncio.sleep(0)
+            
+            received = [
+                [s.queue.get_nowait() for _ in range(s.queue.qsize())]
+                for s in (everything, filtered)
+            ]
+            everything.close()
+            filtered.close()
+            return received, broker.has_subscribers()
+        
+        (everything, filtered), subscribed = async_to_sync(scenario)()
+        self.assertEqual(everything, [RESYNC, {'type': 'attendance', 'id': 4, 'teacher_id': 2}])
+        self.assertEqual(filtered, [{'type': 'attendance', 'id': 4, 'teacher_id': 2}])
+        self.assertFalse(subscribed)
+
+class LiveFeedTests(APIFixtureTestCase):
+    def setUp(self):
+        super().setUp()
+        other_teacher = User.objects.create_user('other', password='secret', role='teacher')
+        self.mine = self.create_students(1)[0]
+        self.theirs = self.create_students(1, self.create_class(other_teacher))[0]
+        self.payment = Payment.objects.create(
+            student=self.mine,
+            class_fee=self.mine.assigned_class,
+            month='january',
+            year=2025,
+            amount=3000
+        )
+    
+    def scan_and_pay(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for student in (self.mine, self.theirs):
+                response = self.client.post(
+                    '/api/attendance/mark/',
+                    {'qr_data': f'STUDENT:{student.id}:{student.full_name}'},
+                    format='json'
+                )
+                self.assertEqual(response.status_code, 201)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.payment.status = 'paid'
+            self.payment.save()
+            # Saving an already paid fee again is not a new event.
+            self.payment.save()
+    
+    def ticket(self, user):
+        self.client.force_authenticate(user)
+        response = self.client.post('/api/live/ticket/')
+        self.client.force_authenticate(self.owner)
+        self.assertEqual(response.status_code, 200)
+        return response.data['ticket']
+    
+    def open_feed(self, ticket):
+        async def get():
+            return await AsyncClient().get('/api/live/feed/', {'ticket': ticket})
+        
+        return async_to_sync(get)()
+    
+    def read_feed(self, user, count):
+        """Open the feed as ``user``, scan and pay, and return ``count`` events."""
+        ticket = self.ticket(user)
+        
+        async def scenario():
+            response = await AsyncClient().get('/api/live/feed/', {'ticket': ticket})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], 'text/event-stream')
+            stream = response.streaming_content
+            self.assertTrue((await anext(stream)).startswith(b'retry:'))
+            
+            await sync_to_async(self.scan_and_pay)()
+            events = []
+            for _ in range(count):
+                chunk = (await asyncio.wait_for(anext(stream), 2)).decode()
+                name, data = chunk.strip().split('\n')
+                events.append((name.removeprefix('event: '), json.loads(data.removeprefix('data: '))))
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(anext(stream), 0.2)
+            await stream.aclose()
+            return events
+        
+        events = async_to_sync(scenario)()
+        self.assertFalse(get_broker().has_subscribers())
+        return events
+    
+    def test_owner_sees_every_new_attendance_and_paid_fee(self):
+        events = self.read_feed(self.owner, 3)
+        self.assertEqual([name for name, _ in events], ['attendance', 'attendance', 'payment'])
+        self.assertEqual({e['student_id'] for _, e in events[:2]}, {self.mine.id, self.theirs.id})
+        self.assertEqual(events[2][1]['id'], self.payment.id)
+        self.assertEqual(float(events[2][1]['amount']), 3000)
+        self.assertEqual(events[2][1]['previous_status'], 'pending')
+    
+    def test_teacher_only_sees_own_classes(self):
+        events = self.read_feed(self.teacher, 2)
+        self.assertEqual([name for name, _ in events], ['attendance', 'payment'])
+        self.assertEqual(events[0][1]['student_id'], self.mine.id)
+        self.assertEqual(events[0][1]['teacher_id'], self.teacher.id)
+    
+    def test_requires_ticket_and_asgi(self):
+        self.assertEqual(self.open_feed('bogus').status_code, 401)
+        self.assertEqual(self.client.get('/api/live/feed/').status_code, 501)
+        
+        self.client.force_authenticate(User.objects.create_user('student', password='secret'))
+        self.assertEqual(self.client.post('/api/live/ticket/').status_code, 403)
+    
+    def test_expired_ticket_is_rejected(self):
+        ticket = self.ticket(self.teacher)
+        with override_settings(LIVE_FEED_TICKET_MAX_AGE=-1):
+            self.assertEqual(self.open_feed(ticket).status_code, 401)
+    
+    def test_deactivated_teacher_cannot_use_a_ticket(self):
+        ticket = self.ticket(self.teacher)
+        self.teacher.is_active = False
+        self.teacher.save()
+        self.assertEqual(self.open_feed(ticket).status_code, 401)
+    
+    def test_nothing_is_queued_without_subscribers(self):
+        self.assertFalse(get_broker().has_subscribers())
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.payment.status = 'paid'
+            self.payment.save()
+        self.assertFalse([c for c in callbacks if c.__module__ == 'live.events'])
+    
+    def test_events_are_built_without_a_query_per_row(self):
+        Attendance.objects.bulk_create([
+            Attendance(student=student, class_attended=student.assigned_class, marked_by=self.teacher)
+            for student in (self.mine, self.theirs)
+        ])
+        with self.assertNumQueries(0):
+            attendance_events([
+                Attendance(id=1, student=self.mine, class_attended=self.mine.assigned_class)
+            ])
+        rows = list(Attendance.objects.all())
+        with self.assertNumQueries(2):
+            events = attendance_events(rows)
+        self.assertEqual({e['student_name'] for e in events}, {self.mine.full_name, self.theirs.full_name})
@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import LiveFeedView, LiveTicketView
+
+urlpatterns = [
+    path('ticket/', LiveTicketView.as_view(), name='live-ticket'),
+    path('feed/', LiveFeedView.as_view(), name='live-feed'),
+]
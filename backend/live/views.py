@@ -0,0 +1,94 @@
+import asyncio
+import json
+import time
+from django.conf import settings
+from django.core import signing
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from accounts.models import User
+from accounts.permissions import IsOwnerOrTeacher
+from .broker import get_broker
+
+TICKET_SALT = 'live.feed'
+
+def issue_ticket(user):
+    return signing.dumps({'user': user.pk}, salt=TICKET_SALT)
+
+async def ticket_user(ticket):
+    """Return the active owner or teacher ``ticket`` was issued to, if it has not expired."""
+    try:
+        user_id = signing.loads(ticket, salt=TICKET_SALT, max_age=settings.LIVE_FEED_TICKET_MAX_AGE)['user']
+    except signing.BadSignature:
+        return None
+    return await User.objects.filter(pk=user_id, is_active=True, role__in=('owner', 'teacher')).afirst()
+
+def format_event(event):
+    return f"event: {event['type']}\ndata: {json.dumps(event, cls=DjangoJSONEncoder)}\n\n"
+
+class LiveTicketView(APIView):
+    """Issue a ticket for opening the live feed.
+    
+    ``EventSource`` cannot send headers, so the feed URL carries this
+    ticket instead of the access token. It is only good for the feed and
+    only for ``LIVE_FEED_TICKET_MAX_AGE`` seconds.
+    """
+    permission_classes = (IsOwnerOrTeacher,)
+    
+    def post(self, request):
+        return Response({
+            'ticket': issue_ticket(request.user),
+            'expires_in': settings.LIVE_FEED_TICKET_MAX_AGE
+        })
+
+class LiveFeedView(View):
+    """Stream new attendance and paid fees to dashboards as Server-Sent Events.
+    
+    The stream is opened with a ``ticket`` from ``LiveTicketView`` and the
+    user it names is loaded again, so a deactivated teacher cannot connect.
+    Teachers only get events for their own classes. Django 4.2 does not tell
+    a view when its client goes away, so each stream ends after
+    ``LIVE_FEED_MAX_AGE`` seconds and the browser reconnects with a new
+    ticket. Needs the ASGI app; under WSGI every open dashboard would hold a
+    worker.
+    """
+    
+    async def get(self, request):
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse({'error': 'The live feed is only served by the ASGI app'}, status=501)
+        
+        user = await ticket_user(request.GET.get('ticket', ''))
+        if user is None:
+            return JsonResponse({'error': 'Invalid or expired ticket'}, status=401)
+        
+        accept = None
+        if user.role == 'teacher':
+            def accept(event):
+                return event['teacher_id'] == user.pk
+        
+        response = StreamingHttpResponse(self.stream(accept), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+    
+    async def stream(self, accept):
+        # Subscribe on the loop that consumes the stream.
+        subscription = get_broker().subscribe(accept)
+        deadline = time.monotonic() + settings.LIVE_FEED_MAX_AGE
+        try:
+            yield f'retry: {settings.LIVE_FEED_RETRY_MS}\n\n'
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.get(),
+                        min(settings.LIVE_FEED_HEARTBEAT, remaining)
+                    )
+                except asyncio.TimeoutError:
+                    yield ': heartbeat\n\n'
+                    continue
+                yield format_event(event)
+        finally:
+            subscription.close()
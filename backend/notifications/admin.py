@@ -0,0 +1,17 @@
+from django.contrib import admin
+from .models import OutboundMessage
+
+@admin.register(OutboundMessage)
+class OutboundMessageAdmin(admin.ModelAdmin):
+    list_display = ('id', 'phone', 'status', 'attempts', 'created_at', 'claimed_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('phone', 'body')
+    raw_id_fields = ('attendance', 'payment', 'digest')
+    date_hierarchy = 'created_at'
+    actions = ('requeue',)
+    
+    @admin.action(description='Requeue selected messages')
+    def requeue(self, request, queryset):
+        """Send failed or stuck messages again on the next ``process_outbox`` run."""
+        count = queryset.exclude(status='sent').update(status='pending', attempts=0, claimed_at=None)
+        self.message_user(request, f'Requeued {count} message(s).')
@@ -0,0 +1,83 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from notifications.outbox import claim_batch, coalesce, record_results
+from utils.sms import RateLimiter, adeliver_many, send_sms
+
+class Command(BaseCommand):
+    help = 'Deliver queued SMS messages from the outbound message queue.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=settings.SMS_OUTBOX_WORKERS,
+            help='Number of concurrent deliveries.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Messages claimed from the queue per round.'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling the queue instead of exiting once it is empty.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=2.0,
+            help='Seconds to wait between polls when the queue is empty.'
+        )
+        parser.add_argument(
+            '--window', type=int, default=settings.SMS_COALESCE_WINDOW,
+            help='Seconds to hold a parent\'s messages so they go out as one digest (0 sends immediately).'
+        )
+        parser.add_argument(
+            '--rate', type=float, default=settings.SMS_RATE_LIMIT,
+            help='Messages sent per second across all workers (0 for no limit).'
+        )
+        parser.add_argument(
+            '--async', action='store_true', dest='use_async',
+            help='Send each batch from an event loop instead of worker threads; '
+                 '--workers then caps the requests in flight.'
+        )
+    
+    def handle(self, *args, **options):
+        total_sent = total_failed = total_merged = 0
+        limiter = RateLimiter(options['rate'])
+        
+        def send(message):
+            limiter.acquire()
+            return send_sms(message.phone, message.body)
+        
+        # Worker threads only talk to the SMS gateway; every database write
+        # happens on this thread.
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            while True:
+                messages = claim_batch(options['batch_size'], window=options['window'])
+                
+                if not messages:
+                    if not options['loop']:
+                        break
+                    time.sleep(options['interval'])
+                    continue
+                
+                deliveries = coalesce(messages, settings.SMS_DEDUP_WINDOW)
+                total_merged += len(messages) - len(deliveries)
+                
+                if options['use_async']:
+                    delivered = [
+                        result['status'] == 'sent'
+                        for result in asyncio.run(
+                            adeliver_many([(m.phone, m.body) for m in deliveries], options['workers'], limiter)
+                        )
+                    ]
+                else:
+                    delivered = pool.map(send, deliveries)
+                results = dict(zip([m.id for m in deliveries], delivered))
+                sent, failed = record_results(deliveries, results)
+                total_sent += sent
+                total_failed += failed
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'Delivered {total_sent} message(s), {total_failed} failed attempt(s), '
+            f'{total_merged} folded into digests or dropped as duplicates.'
+        ))
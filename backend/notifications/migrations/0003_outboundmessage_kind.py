@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:34
+
+from django.db import migrations, models
+
+
+def classify_payment_messages(apps, schema_editor):
+    OutboundMessage = apps.get_model('notifications', 'OutboundMessage')
+    Payment = apps.get_model('payments', 'Payment')
+    payment_messages = OutboundMessage.objects.filter(payment__isnull=False)
+    payment_messages.filter(body__contains='is overdue').update(kind='reminder')
+    payment_messages.exclude(kind='reminder').update(kind='receipt')
+    # Delivered reminders used to flag unpaid fees as notified.
+    Payment.objects.exclude(status='paid').filter(
+        sms_sent=True, outbound_messages__kind='reminder'
+    ).update(sms_sent=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_outboundmessage_digest_alter_outboundmessage_status'),
+        ('payments', '0002_monthlyincome'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboundmessage',
+            name='kind',
+            field=models.CharField(choices=[('notice', 'Notice'), ('receipt', 'Payment receipt'), ('reminder', 'Payment reminder')], default='notice', max_length=10),
+        ),
+        migrations.RunPython(classify_payment_messages, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_outboundmessage_kind'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='outboundmessage',
+            name='kind',
+            field=models.CharField(choices=[('notice', 'Notice'), ('receipt', 'Payment receipt'), ('reminder', 'Payment reminder'), ('broadcast', 'Broadcast')], default='notice', max_length=10),
+        ),
+    ]
@@ -0,0 +1,59 @@
+from django.db import models
+
+class OutboundMessage(models.Model):
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+        ('coalesced', 'Coalesced'),
+        ('duplicate', 'Duplicate'),
+    )
+    # Only receipts mark a payment's ``sms_sent``; reminders are linked for
+    # reference but do not count as the parent being told the fee was paid.
+    # Broadcasts are always sent on their own, never folded into a digest.
+    KIND_CHOICES = (
+        ('notice', 'Notice'),
+        ('receipt', 'Payment receipt'),
+        ('reminder', 'Payment reminder'),
+        ('broadcast', 'Broadcast'),
+    )
+    
+    phone = models.CharField(max_length=15)
+    body = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default='notice')
+    attempts = models.PositiveIntegerField(default=0)
+    attendance = models.ForeignKey(
+        'attendance.Attendance',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='outbound_messages'
+    )
+    payment = models.ForeignKey(
+        'payments.Payment',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='outbound_messages'
+    )
+    digest = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='merged_messages'
+    )
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='outbox_status_created_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.phone} - {self.status}"
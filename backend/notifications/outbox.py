@@ -0,0 +1,166 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+from attendance.models import Attendance
+from payments.models import Payment
+from utils.cache import invalidate_models
+from .models import OutboundMessage
+
+# Twilio rejects bodies longer than this, so digests are split at it.
+DIGEST_MAX_LENGTH = 1600
+
+def claim_batch(batch_size, window=0):
+    """Move up to ``batch_size`` pending messages to ``sending`` and return them.
+    
+    Messages left in ``sending`` by a worker that died are put back in the
+    queue once ``SMS_OUTBOX_CLAIM_TIMEOUT`` seconds have passed.
+    
+    With a coalescing ``window`` (in seconds) a phone is only claimed once its
+    oldest pending message has waited that long, and then all of its pending
+    messages are claimed together so ``coalesce`` can fold them into one SMS.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.SMS_OUTBOX_CLAIM_TIMEOUT)
+    OutboundMessage.objects.filter(status='sending', claimed_at__lt=stale).update(status='pending')
+    
+    pending = OutboundMessage.objects.filter(status='pending')
+    if window:
+        phones = list(
+            pending.filter(created_at__lte=now - timedelta(seconds=window))
+            .order_by()
+            .values_list('phone', flat=True)
+            .distinct()[:batch_size]
+        )
+        ids = list(pending.filter(phone__in=phones).values_list('id', flat=True)) if phones else []
+    else:
+        ids = list(pending.values_list('id', flat=True)[:batch_size])
+    if not ids:
+        return []
+    
+    OutboundMessage.objects.filter(id__in=ids, status='pending').update(
+        status='sending',
+        claimed_at=now
+    )
+    return list(OutboundMessage.objects.filter(id__in=ids, status='sending', claimed_at=now))
+
+def coalesce(messages, dedup_window=0):
+    """Fold claimed ``messages`` into one delivery per phone and return those.
+    
+    A body already queued in this batch, or sent to the same phone in the
+    last ``dedup_window`` seconds, is marked ``duplicate``. The remaining
+    bodies for a phone are appended to its oldest message as a digest and
+    the others are marked ``coalesced``; both point at the message that
+    carries their text through ``digest``. Broadcasts are delivered as they
+    are.
+    """
+    if not messages:
+        return []
+    
+    recent = {}
+    if dedup_window:
+        since = timezone.now() - timedelta(seconds=dedup_window)
+        sent = OutboundMessage.objects.filter(
+            status='sent',
+            sent_at__gte=since,
+            phone__in={m.phone for m in messages}
+        ).values_list('id', 'phone', 'body')
+        for message_id, phone, body in sent:
+            for line in body.split('\n'):
+                recent.setdefault((phone, line), message_id)
+    
+    groups = {}
+    broadcasts = []
+    for message in sorted(messages, key=lambda m: (m.created_at, m.id)):
+        if message.kind == 'broadcast':
+            broadcasts.append(message)
+        else:
+            groups.setdefault(message.phone, []).append(message)
+    
+    deliveries, digests, merged, already_sent = [], [], [], []
+    for phone, group in groups.items():
+        carriers = {}
+        digest = None
+        for message in group:
+            carrier = carriers.get(message.body)
+            if carrier is None and (phone, message.body) in recent:
+                carrier = recent[(phone, message.body)]
+                already_sent.append(message.id)
+            if carrier is not None:
+                message.status = 'duplicate'
+                message.digest_id = carrier
+                merged.append(message)
+                continue
+            
+            if digest and len(digest.body) + 1 + len(message.body) <= DIGEST_MAX_LENGTH:
+                digest.body = f'{digest.body}\n{message.body}'
+                message.status = 'coalesced'
+                message.digest_id = digest.id
+                merged.append(message)
+                if digest not in digests:
+                    digests.append(digest)
+            else:
+                digest = message
+                deliveries.append(message)
+            
+            # A retried digest already carries several bodies.
+            for line in message.body.split('\n'):
+                carriers.setdefault(line, digest.id)
+    
+    if digests:
+        OutboundMessage.objects.bulk_update(digests, ['body'])
+    if merged:
+        OutboundMessage.objects.bulk_update(merged, ['status', 'digest'])
+    if already_sent:
+        mark_notified(already_sent)
+    return deliveries + broadcasts
+
+def mark_notified(message_ids):
+    """Flip ``sms_sent`` for the rows behind ``message_ids`` and anything merged into them.
+    
+    Payments are only flagged by receipts, not by overdue reminders.
+    """
+    rows = list(OutboundMessage.objects.filter(
+        Q(id__in=message_ids) | Q(digest_id__in=message_ids)
+    ).values_list('attendance_id', 'payment_id', 'kind'))
+    attendance_ids = [a for a, _, _ in rows if a]
+    payment_ids = [p for _, p, kind in rows if p and kind == 'receipt']
+    if attendance_ids:
+        Attendance.objects.filter(id__in=attendance_ids).update(sms_sent=True)
+    if payment_ids:
+        Payment.objects.filter(id__in=payment_ids).update(sms_sent=True)
+        invalidate_models(Payment)
+
+def record_results(messages, results):
+    """Persist delivery results for claimed ``messages``.
+    
+    ``results`` maps message id to a boolean delivery flag. Delivered messages
+    flip ``sms_sent`` on the attendance or payment rows they carried.
+    """
+    sent = [m for m in messages if results.get(m.id)]
+    failed = [m for m in messages if not results.get(m.id)]
+    
+    if sent:
+        OutboundMessage.objects.filter(id__in=[m.id for m in sent]).update(
+            status='sent',
+            sent_at=timezone.now(),
+            attempts=F('attempts') + 1
+        )
+        mark_notified([m.id for m in sent])
+    
+    if failed:
+        max_attempts = settings.SMS_OUTBOX_MAX_ATTEMPTS
+        exhausted = [m.id for m in failed if m.attempts + 1 >= max_attempts]
+        retry = [m.id for m in failed if m.attempts + 1 < max_attempts]
+        if exhausted:
+            OutboundMessage.objects.filter(id__in=exhausted).update(
+                status='failed',
+                attempts=F('attempts') + 1
+            )
+        if retry:
+            OutboundMessage.objects.filter(id__in=retry).update(
+                status='pending',
+                attempts=F('attempts') + 1
+            )
+    
+    return len(sent), len(failed)
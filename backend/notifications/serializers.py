@@ -0,0 +1,7 @@
+from rest_framework import serializers
+
+class BroadcastSerializer(serializers.Serializer):
+    message = serializers.CharField(max_length=1600)
+    class_id = serializers.IntegerField(required=False)
+    active_only = serializers.BooleanField(default=True)
+    outstanding_only = serializers.BooleanField(default=False)
@@ -0,0 +1,216 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from accounts.models import User
+from attendance.models import Attendance
+from notifications.models import OutboundMessage
+from payments.models import Payment
+from utils import sms
+from utils.testing import FakeSmsGateway, APIFixtureTestCase
+
+TWILIO_TEST_SETTINGS = {
+    'TWILIO_ACCOUNT_SID': 'AC00000000000000000000000000000000',
+    'TWILIO_AUTH_TOKEN': 'token',
+    'TWILIO_PHONE_NUMBER': '+15005550006',
+    'SMS_RETRY_BACKOFF': 0,
+    'SMS_RATE_LIMIT': 0,
+}
+
+class BroadcastTests(APIFixtureTestCase):
+    def broadcast(self, gateway, **data):
+        with override_settings(TWILIO_API_BASE_URL=gateway.url, **TWILIO_TEST_SETTINGS):
+            return self.client.post('/api/notifications/broadcast/', {'message': 'Closed tomorrow', **data}, format='json')
+    
+    def test_broadcast_retries_rate_limited_and_server_errors(self):
+        students = self.create_students(3)
+        flaky, broken = students[0].parent_phone, students[1].parent_phone
+        
+        with FakeSmsGateway({flaky: [429, 503], broken: [400]}) as gateway:
+            response = self.broadcast(gateway)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['recipients'], 3)
+        self.assertEqual(response.data['sent'], 2)
+        results = {r['to']: r for r in response.data['results']}
+        self.assertEqual(results[flaky]['status'], 'sent')
+        self.assertEqual(results[flaky]['attempts'], 3)
+        self.assertEqual(results[broken]['status'], 'failed')
+        self.assertEqual(results[broken]['attempts'], 1)
+        self.assertEqual(gateway.sent_to().count(flaky), 3)
+    
+    def test_broadcast_filters_by_class_and_outstanding_payments(self):
+        first = self.create_students(2)
+        self.create_students(2)
+        Payment.objects.create(
+            student=first[0], class_fee=first[0].assigned_class,
+            month='january', year=2025, amount=3000, status='overdue'
+        )
+        
+        with FakeSmsGateway() as gateway:
+            response = self.broadcast(gateway, class_id=first[0].assigned_class_id, outstanding_only=True)
+        
+        self.assertEqual(response.data['recipients'], 1)
+        self.assertEqual(gateway.sent_to(), [first[0].parent_phone])
+    
+    def test_large_broadcast_is_queued_with_per_recipient_status(self):
+        sms.outbox.clear()
+        students = self.create_students(3)
+        
+        with FakeSmsGateway() as gateway, override_settings(SMS_BROADCAST_SYNC_LIMIT=2):
+            response = self.broadcast(gateway)
+        
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['recipients'], 3)
+        self.assertEqual(response.data['queued'], 3)
+        self.assertEqual(gateway.requests, [])
+        self.assertCountEqual([r['to'] for r in response.data['results']], [s.parent_phone for s in students])
+        ids = ','.join(str(r['id']) for r in response.data['results'])
+        
+        statuses = self.client.get(f'/api/notifications/messages/?ids={ids}').data['results']
+        self.assertEqual({r['status'] for r in statuses}, {'pending'})
+        self.assertEqual(OutboundMessage.objects.filter(kind='broadcast').count(), 3)
+        
+        with override_settings(SMS_BACKEND='utils.sms.backends.locmem.SmsBackend'):
+            call_command('process_outbox', window=0, stdout=StringIO())
+        self.assertEqual(len(sms.outbox), 3)
+        statuses = self.client.get(f'/api/notifications/messages/?ids={ids}').data['results']
+        self.assertEqual({r['status'] for r in statuses}, {'sent'})
+        self.assertEqual(self.client.get('/api/notifications/messages/?ids=x').status_code, 400)
+    
+    def test_broadcast_requires_owner(self):
+        self.client.force_authenticate(self.teacher)
+        with FakeSmsGateway() as gateway:
+            response = self.broadcast(gateway)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(gateway.requests, [])
+
+
+class SmsBackendTests(SimpleTestCase):
+    def setUp(self):
+        sms.outbox.clear()
+    
+    @override_settings(SMS_BACKEND='utils.sms.backends.locmem.SmsBackend')
+    def test_locmem_backend_records_messages(self):
+        self.assertTrue(sms.send_sms('+94770000001', 'Hello'))
+        self.assertEqual(sms.outbox[0]['to'], '+94770000001')
+        self.assertEqual(sms.outbox[0]['body'], 'Hello')
+    
+    def test_file_backend_appends_json_lines(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.unlink, path)
+        with override_settings(SMS_BACKEND='utils.sms.backends.filebased.SmsBackend', SMS_FILE_PATH=path):
+            sms.send_sms('+94770000001', 'First')
+            sms.send_sms('+94770000002', 'Second')
+        with open(path) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([r['body'] for r in records], ['First', 'Second'])
+
+@override_settings(SMS_BACKEND='utils.sms.backends.locmem.SmsBackend')
+class OutboxTests(APIFixtureTestCase):
+    def test_scan_queues_sms_and_worker_marks_it_sent(self):
+        sms.outbox.clear()
+        student = self.create_students(1)[0]
+        
+        response = self.client.post(
+            '/api/attendance/mark/', {'qr_data': f'STUDENT:{student.id}:{student.full_name}'}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(sms.outbox, [])
+        
+        call_command('process_outbox', window=0, stdout=StringIO())
+        self.assertEqual(len(sms.outbox), 1)
+        self.assertTrue(Attendance.objects.get(student=student).sms_sent)
+    
+    def test_siblings_share_one_digest_and_duplicates_are_dropped(self):
+        sms.outbox.clear()
+        first, second = self.create_students(2)
+        second.parent_phone = first.parent_phone
+        second.save()
+        for student in (first, second):
+            attendance = Attendance.objects.create(student=student, class_attended=student.assigned_class)
+            sms.queue_attendance_sms(attendance)
+        sms.queue_sms(first.parent_phone, sms.attendance_message(first, first.assigned_class.name))
+        
+        call_command('process_outbox', window=60, stdout=StringIO())
+        self.assertEqual(sms.outbox, [])
+        
+        call_command('process_outbox', window=0, stdout=StringIO())
+        self.assertEqual(len(sms.outbox), 1)
+        self.assertEqual(sms.outbox[0]['body'].split('\n'), [
+            sms.attendance_message(first, first.assigned_class.name),
+            sms.attendance_message(second, second.assigned_class.name),
+        ])
+        self.assertEqual(Attendance.objects.filter(sms_sent=True).count(), 2)
+        
+        sms.queue_sms(first.parent_phone, sms.attendance_message(second, second.assigned_class.name))
+        call_command('process_outbox', window=0, stdout=StringIO())
+        self.assertEqual(len(sms.outbox), 1)
+    
+    def test_broadcasts_are_not_folded_into_digests(self):
+        sms.outbox.clear()
+        student = self.create_students(1)[0]
+        attendance = Attendance.objects.create(student=student, class_attended=student.assigned_class)
+        sms.queue_attendance_sms(attendance)
+        sms.queue_sms(student.parent_phone, 'Closed tomorrow', kind='broadcast')
+        
+        call_command('process_outbox', window=0, stdout=StringIO())
+        self.assertEqual(sorted(m['body'] for m in sms.outbox), sorted([
+            'Closed tomorrow', sms.attendance_message(student, student.assigned_class.name)
+        ]))
+    
+    @override_settings(SMS_BACKEND='utils.sms.backends.locmem.SmsBackend')
+    def test_worker_sends_under_the_rate_limit(self):
+        for student in self.create_students(3):
+            sms.queue_sms(student.parent_phone, f'Hello {student.full_name}')
+            sms.queue_sms(student.parent_phone, 'Closed tomorrow', kind='broadcast')
+        
+        with mock.patch.object(sms.RateLimiter, 'acquire', autospec=True) as acquire:
+            call_command('process_outbox', window=0, rate=5, stdout=StringIO())
+        self.assertEqual(acquire.call_count, 6)
+        self.assertEqual(acquire.call_args.args[0].rate, 5)
+        
+        OutboundMessage.objects.update(status='pending')
+        with mock.patch.object(sms.RateLimiter, 'aacquire', autospec=True) as aacquire:
+            call_command('process_outbox', window=0, rate=5, use_async=True, stdout=StringIO())
+        self.assertEqual(aacquire.await_count, 6)
+    
+    def test_async_worker_retries_through_gateway(self):
+        first, second = self.create_students(2)
+        for student in (first, second):
+            sms.queue_sms(student.parent_phone, f'Hello {student.full_name}')
+        
+        with FakeSmsGateway({first.parent_phone: [429, 503], second.parent_phone: [400]}) as gateway:
+            with override_settings(
+                SMS_BACKEND='utils.sms.backends.twilio.SmsBackend',
+                TWILIO_API_BASE_URL=gateway.url,
+                SMS_OUTBOX_MAX_ATTEMPTS=1,
+                **TWILIO_TEST_SETTINGS
+            ):
+                call_command('process_outbox', window=0, use_async=True, stdout=StringIO())
+        
+        self.assertEqual(sorted(gateway.sent_to()), sorted([first.parent_phone] * 3 + [second.parent_phone]))
+        statuses = dict(OutboundMessage.objects.values_list('phone', 'status'))
+        self.assertEqual(statuses, {first.parent_phone: 'sent', second.parent_phone: 'failed'})
+
+class OutboundMessageAdminTests(APIFixtureTestCase):
+    def test_requeue_action_resets_failed_and_stuck_messages(self):
+        admin_user = User.objects.create_superuser('admin', password='secret', role='owner')
+        failed = OutboundMessage.objects.create(phone='+94770000001', body='A', status='failed', attempts=3)
+        sent = OutboundMessage.objects.create(phone='+94770000002', body='B', status='sent', attempts=1)
+        self.client.force_login(admin_user)
+        
+        response = self.client.post('/admin/notifications/outboundmessage/', {
+            'action': 'requeue',
+            '_selected_action': [failed.pk, sent.pk],
+        })
+        self.assertEqual(response.status_code, 302)
+        failed.refresh_from_db()
+        sent.refresh_from_db()
+        self.assertEqual((failed.status, failed.attempts), ('pending', 0))
+        self.assertEqual(sent.status, 'sent')
+        self.assertEqual(self.client.get('/admin/notifications/outboundmessage/?status__exact=pending').status_code, 200)
@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import BroadcastView, MessageStatusView
+
+urlpatterns = [
+    path('broadcast/', BroadcastView.as_view(), name='sms-broadcast'),
+    path('messages/', MessageStatusView.as_view(), name='sms-message-status'),
+]
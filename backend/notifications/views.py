@@ -0,0 +1,78 @@
+from django.conf import settings
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from payments.models import OUTSTANDING_STATUSES
+from students.models import Student
+from utils.sms import broadcast_sms, bulk_queue_sms
+from accounts.permissions import IsOwner
+from .models import OutboundMessage
+from .serializers import BroadcastSerializer
+
+class BroadcastView(APIView):
+    """Send one message to the parents of a filtered set of students.
+    
+    Each parent phone number is messaged once, even with several children.
+    Up to ``SMS_BROADCAST_SYNC_LIMIT`` recipients are sent to in the request;
+    larger broadcasts are queued for ``process_outbox`` and answered with 202
+    and each recipient's message id, which ``MessageStatusView`` reports on.
+    """
+    permission_classes = (IsOwner,)
+    
+    def post(self, request):
+        serializer = BroadcastSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        students = Student.objects.all()
+        if data.get('class_id'):
+            students = students.filter(assigned_class_id=data['class_id'])
+        if data['active_only']:
+            students = students.filter(is_active=True)
+        if data['outstanding_only']:
+            students = students.filter(payments__status__in=OUTSTANDING_STATUSES)
+        
+        phones = list(
+            students.order_by('parent_phone')
+            .values_list('parent_phone', flat=True)
+            .distinct()
+        )
+        if len(phones) > settings.SMS_BROADCAST_SYNC_LIMIT:
+            queued = bulk_queue_sms(
+                {'to_phone': phone, 'message': data['message'], 'kind': 'broadcast'}
+                for phone in phones
+            )
+            return Response({
+                'recipients': len(phones),
+                'queued': len(queued),
+                'results': [{'to': m.phone, 'id': m.id, 'status': m.status} for m in queued]
+            }, status=status.HTTP_202_ACCEPTED)
+        
+        results = broadcast_sms(phones, data['message'])
+        
+        return Response({
+            'recipients': len(results),
+            'sent': sum(1 for r in results if r['status'] == 'sent'),
+            'failed': sum(1 for r in results if r['status'] != 'sent'),
+            'results': results
+        }, status=status.HTTP_200_OK)
+
+class MessageStatusView(APIView):
+    """Report delivery status for the queued messages in ``?ids=1,2,3``."""
+    permission_classes = (IsOwner,)
+    
+    def get(self, request):
+        try:
+            ids = [int(i) for i in request.query_params.get('ids', '').split(',') if i]
+        except ValueError:
+            return Response({'error': 'ids must be a comma-separated list of message ids'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        messages = OutboundMessage.objects.filter(id__in=ids).order_by('id').values_list(
+            'id', 'phone', 'status', 'attempts', 'sent_at'
+        )
+        return Response({
+            'results': [
+                {'id': message_id, 'to': phone, 'status': state, 'attempts': attempts, 'sent_at': sent_at}
+                for message_id, phone, state, attempts, sent_at in messages
+            ]
+        })
@@ -0,0 +1,104 @@
+import datetime
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from students.models import Student
+from utils.cache import invalidate_models
+from utils.sms import bulk_queue_sms, payment_reminder_message
+from .models import Payment
+
+MONTHS = [choice for choice, _ in Payment.MONTH_CHOICES]
+
+def current_period():
+    today = timezone.localdate()
+    return Payment.MONTH_CHOICES[today.month - 1][0], today.year
+
+def generate_invoices(month, year, batch_size=1000):
+    """Create a pending ``Payment`` for every active, assigned student.
+    
+    Rows that already exist for the student/class/month/year are left alone,
+    so re-running a billing period is safe.
+    """
+    students = (
+        Student.objects.filter(is_active=True, assigned_class__isnull=False)
+        .values_list('id', 'assigned_class_id', 'assigned_class__fee_per_month')
+    )
+    invoices = [
+        Payment(
+            student_id=student_id,
+            class_fee_id=class_id,
+            month=month,
+            year=year,
+            amount=fee,
+            status='pending'
+        )
+        for student_id, class_id, fee in students.iterator(chunk_size=batch_size)
+    ]
+    
+    period = Payment.objects.filter(month=month, year=year)
+    with transaction.atomic():
+        before = period.count()
+        Payment.objects.bulk_create(invoices, batch_size=batch_size, ignore_conflicts=True)
+        created = period.count() - before
+        invalidate_models(Payment)
+    
+    return {
+        'month': month,
+        'year': year,
+        'students': len(invoices),
+        'created': created,
+        'skipped': len(invoices) - created,
+    }
+
+def overdue_filter(today, grace_days):
+    """Q matching billing months whose due date has passed.
+    
+    A month's fee is due ``grace_days`` after the first day of that month.
+    """
+    cutoff = today - datetime.timedelta(days=grace_days)
+    year, month = cutoff.year, cutoff.month
+    if cutoff.day == 1:
+        # The cutoff month itself is due today, not yet overdue.
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return Q(year__lt=year) | Q(year=year, month__in=MONTHS[:month])
+
+def sweep_overdue(today=None, grace_days=None, notify=True, batch_size=500):
+    """Mark stale pending payments overdue with a single ``UPDATE``.
+    
+    The affected rows are locked and read once, so the reminders queued when
+    ``notify`` is set (inserted ``batch_size`` at a time) and the ``UPDATE``
+    cover exactly the same rows.
+    """
+    today = today or timezone.localdate()
+    if grace_days is None:
+        grace_days = settings.PAYMENT_GRACE_DAYS
+    stale = Payment.objects.filter(status='pending').filter(overdue_filter(today, grace_days))
+    
+    updated = reminders = 0
+    with transaction.atomic():
+        rows = list(
+            stale.select_for_update(of=('self',)).order_by('id')
+            .values_list('id', 'student__parent_phone', 'student__full_name', 'month', 'year')
+        )
+        if not rows:
+            return {'overdue': 0, 'reminders': 0}
+        
+        if notify:
+            reminders = len(bulk_queue_sms(
+                (
+                    {
+                        'to_phone': phone,
+                        'message': payment_reminder_message(name, month, year),
+                        'payment': Payment(pk=payment_id),
+                        'kind': 'reminder'
+                    }
+                    for payment_id, phone, name, month, year in rows
+                ),
+                batch_size=batch_size
+            ))
+        # Ids only grow, so the bound keeps rows inserted since the read out.
+        updated = stale.filter(id__lte=rows[-1][0]).update(status='overdue', updated_at=timezone.now())
+        invalidate_models(Payment)
+    
+    return {'overdue': updated, 'reminders': reminders}
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from payments.models import Payment, MonthlyIncome
+from utils.cache import invalidate_models
+
+class Command(BaseCommand):
+    help = 'Rebuild the monthly income rollup table from paid payments.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, help='Only rebuild rollups for this year.')
+    
+    def handle(self, *args, **options):
+        payments = Payment.objects.filter(status='paid')
+        rollups = MonthlyIncome.objects.all()
+        if options['year']:
+            payments = payments.filter(year=options['year'])
+            rollups = rollups.filter(year=options['year'])
+        
+        totals = (
+            payments.order_by()
+            .values('class_fee', 'month', 'year')
+            .annotate(total_amount=Sum('amount'), payment_count=Count('id'))
+        )
+        
+        with transaction.atomic():
+            rollups.delete()
+            created = MonthlyIncome.objects.bulk_create([
+                MonthlyIncome(
+                    class_fee_id=row['class_fee'],
+                    month=row['month'],
+                    year=row['year'],
+                    total_amount=row['total_amount'],
+                    payment_count=row['payment_count']
+                )
+                for row in totals
+            ], batch_size=1000)
+            invalidate_models(MonthlyIncome)
+        
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {len(created)} monthly income row(s).'))
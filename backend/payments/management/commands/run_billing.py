@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from payments.billing import current_period, generate_invoices
+from payments.models import Payment
+
+class Command(BaseCommand):
+    help = 'Generate pending payments for every active student for a billing month.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--month', help='Month name, e.g. january. Defaults to the current month.')
+        parser.add_argument('--year', type=int, help='Defaults to the current year.')
+    
+    def handle(self, *args, **options):
+        month, year = current_period()
+        month = (options['month'] or month).lower()
+        year = options['year'] or year
+        
+        if month not in dict(Payment.MONTH_CHOICES):
+            raise CommandError(f"Unknown month '{options['month']}'.")
+        
+        result = generate_invoices(month, year)
+        self.stdout.write(self.style.SUCCESS(
+            f"Billed {result['students']} student(s) for {month.capitalize()} {year}: "
+            f"{result['created']} created, {result['skipped']} already existed."
+        ))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from payments.billing import sweep_overdue
+
+class Command(BaseCommand):
+    help = (
+        'Mark pending payments past their due date as overdue and queue reminder SMS. '
+        'Safe to run periodically, e.g. daily from cron.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-days', type=int,
+            help='Days after the first of the month before a fee is overdue (default: PAYMENT_GRACE_DAYS).'
+        )
+        parser.add_argument('--no-sms', action='store_true', help='Do not queue reminder messages.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Reminders inserted per batch.')
+    
+    def handle(self, *args, **options):
+        result = sweep_overdue(
+            grace_days=options['grace_days'],
+            notify=not options['no_sms'],
+            batch_size=options['batch_size']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Marked {result['overdue']} payment(s) overdue, queued {result['reminders']} reminder(s)."
+        ))
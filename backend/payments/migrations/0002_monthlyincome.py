@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:29
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_monthly_income(apps, schema_editor):
+    Payment = apps.get_model('payments', 'Payment')
+    MonthlyIncome = apps.get_model('payments', 'MonthlyIncome')
+    totals = (
+        Payment.objects.filter(status='paid')
+        .order_by()
+        .values('class_fee', 'month', 'year')
+        .annotate(total_amount=models.Sum('amount'), payment_count=models.Count('id'))
+    )
+    MonthlyIncome.objects.bulk_create([
+        MonthlyIncome(
+            class_fee_id=row['class_fee'],
+            month=row['month'],
+            year=row['year'],
+            total_amount=row['total_amount'],
+            payment_count=row['payment_count']
+        )
+        for row in totals
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('classes', '0001_initial'),
+        ('payments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyIncome',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.CharField(choices=[('january', 'January'), ('february', 'February'), ('march', 'March'), ('april', 'April'), ('may', 'May'), ('june', 'June'), ('july', 'July'), ('august', 'August'), ('september', 'September'), ('october', 'October'), ('november', 'November'), ('december', 'December')], max_length=15)),
+                ('year', models.IntegerField()),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('payment_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('class_fee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_incomes', to='classes.class')),
+            ],
+            options={
+                'ordering': ['-year', 'class_fee'],
+                'unique_together': {('class_fee', 'month', 'year')},
+            },
+        ),
+        migrations.RunPython(populate_monthly_income, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,37 @@
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 from students.models import Student
 from classes.models import Class
 
+OUTSTANDING_STATUSES = ('pending', 'overdue')
+
+class Constant(models.Value):
+    """A string value written into the SQL instead of bound as a parameter.
+    
+    SQLite only matches a partial index such as payment_outstanding_idx when
+    the query compares against constants. Only use it for fixed values.
+    """
+    
+    def as_sql(self, compiler, connection):
+        return "'%s'" % self.value.replace("'", "''"), []
+
+class PaymentQuerySet(models.QuerySet):
+    def for_api(self):
+        return self.select_related('student', 'class_fee', 'received_by')
+    
+    def filter_params(self, params):
+        """Apply the ``student_id`` and ``status`` query parameters."""
+        queryset = self
+        if params.get('student_id'):
+            queryset = queryset.filter(student_id=params['student_id'])
+        if params.get('status'):
+            queryset = queryset.filter(status=params['status'])
+        return queryset
+    
+    def outstanding(self):
+        return self.filter(Q(status__in=[Constant(status) for status in OUTSTANDING_STATUSES]))
+
 class Payment(models.Model):
     MONTH_CHOICES = (
         ('january', 'January'),
@@ -44,9 +73,48 @@ class Payment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = PaymentQuerySet.as_manager()
+    
     class Meta:
         unique_together = ['student', 'class_fee', 'month', 'year']
         ordering = ['-year', '-created_at']
+        indexes = [
+            models.Index(fields=['student', 'status'], name='payment_student_status_idx'),
+            models.Index(fields=['status', '-year', '-created_at'], name='payment_status_year_idx'),
+            models.Index(fields=['year', 'month', 'status'], name='payment_period_status_idx'),
+            models.Index(
+                fields=['-year', '-created_at'],
+                name='payment_outstanding_idx',
+                condition=models.Q(status__in=OUTSTANDING_STATUSES)
+            ),
+        ]
     
     def __str__(self):
         return f"{self.student.full_name} - {self.month} {self.year} - {self.status}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what was loaded so the income rollup can apply deltas on save.
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+class MonthlyIncome(models.Model):
+    """Paid totals per class and month, kept in step with ``Payment`` by signals.
+    
+    Queryset ``update()``/``bulk_create()`` calls on payments bypass the signals;
+    run ``rebuild_income_rollup`` after changing paid payments in bulk.
+    """
+    class_fee = models.ForeignKey(Class, on_delete=models.CASCADE, related_name='monthly_incomes')
+    month = models.CharField(max_length=15, choices=Payment.MONTH_CHOICES)
+    year = models.IntegerField()
+    total_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    payment_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['class_fee', 'month', 'year']
+        ordering = ['-year', 'class_fee']
+    
+    def __str__(self):
+        return f"{self.class_fee.name} - {self.month} {self.year} - {self.total_amount}"
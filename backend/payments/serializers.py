@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from .models import Payment
+from utils.serializers import DynamicFieldsMixin
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.full_name', read_only=True)
     class_name = serializers.CharField(source='class_fee.name', read_only=True)
     received_by_name = serializers.CharField(source='received_by.get_full_name', read_only=True)
@@ -13,3 +14,12 @@ class PaymentSerializer(serializers.ModelSerializer):
                   'month_display', 'year', 'amount', 'status', 'payment_date', 
                   'received_by', 'received_by_name', 'sms_sent', 'notes', 'created_at', 'updated_at']
         read_only_fields = ['id', 'sms_sent', 'created_at', 'updated_at']
+
+class BillingRunSerializer(serializers.Serializer):
+    month = serializers.ChoiceField(choices=Payment.MONTH_CHOICES, required=False)
+    year = serializers.IntegerField(min_value=2000, max_value=2100, required=False)
+    
+    def to_internal_value(self, data):
+        if isinstance(data.get('month'), str):
+            data = {**data, 'month': data['month'].lower()}
+        return super().to_internal_value(data)
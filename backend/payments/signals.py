@@ -0,0 +1,77 @@
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import Signal, receiver
+from .models import Payment, MonthlyIncome
+
+# Sent after a saved payment's status changed, with ``previous`` set to the
+# stored status it replaced (None for a new payment).
+status_changed = Signal()
+
+TRACKED_FIELDS = ('status', 'class_fee_id', 'month', 'year', 'amount')
+
+def _paid_key(values):
+    if values.get('status') != 'paid':
+        return None
+    return (values['class_fee_id'], values['month'], values['year'])
+
+def _current_values(payment):
+    values = {field: getattr(payment, field) for field in TRACKED_FIELDS}
+    values['amount'] = Decimal(str(values['amount']))
+    return values
+
+def _has_tracked_values(payment):
+    loaded = getattr(payment, '_loaded_values', None)
+    return loaded is not None and all(field in loaded for field in TRACKED_FIELDS)
+
+def apply_income_delta(key, amount, count):
+    class_fee_id, month, year = key
+    with transaction.atomic():
+        rollup, _ = MonthlyIncome.objects.get_or_create(
+            class_fee_id=class_fee_id,
+            month=month,
+            year=year
+        )
+        MonthlyIncome.objects.filter(pk=rollup.pk).update(
+            total_amount=F('total_amount') + amount,
+            payment_count=F('payment_count') + count
+        )
+
+@receiver(pre_save, sender=Payment)
+def remember_previous_values(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None or _has_tracked_values(instance):
+        return
+    # Instance was not loaded from the database (or only partially), so read
+    # the stored values the rollup currently accounts for.
+    instance._loaded_values = (
+        Payment.objects.filter(pk=instance.pk).values(*TRACKED_FIELDS).first() or {}
+    )
+
+@receiver(post_save, sender=Payment)
+def update_income_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    
+    previous = {} if created else instance._loaded_values
+    current = _current_values(instance)
+    instance._loaded_values = current
+    
+    if previous.get('status') != current['status']:
+        status_changed.send(sender=Payment, instance=instance, previous=previous.get('status'))
+    
+    old_key, new_key = _paid_key(previous), _paid_key(current)
+    if old_key == new_key and (old_key is None or previous['amount'] == current['amount']):
+        return
+    
+    if old_key:
+        apply_income_delta(old_key, -previous['amount'], -1)
+    if new_key:
+        apply_income_delta(new_key, current['amount'], 1)
+
+@receiver(post_delete, sender=Payment)
+def update_income_on_delete(sender, instance, **kwargs):
+    values = instance._loaded_values if _has_tracked_values(instance) else _current_values(instance)
+    key = _paid_key(values)
+    if key:
+        apply_income_delta(key, -values['amount'], -1)
@@ -1,3 +1,253 @@
-from django.test import TestCase
+import csv
+import datetime
+from io import BytesIO, StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count, Sum
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from openpyxl import load_workbook
+from notifications.models import OutboundMessage
+from payments.billing import generate_invoices, overdue_filter, sweep_overdue
+from payments.models import MonthlyIncome, Payment
+from students.models import Student
+from utils import sms
+from utils.testing import APIFixtureTestCase, ListQueryCountTestCase
 
-# Create your tests here.
+class PaymentListQueryCountTests(ListQueryCountTestCase):
+    def add_payments(self, count, status='pending'):
+        for student in self.create_students(count):
+            Payment.objects.create(
+                student=student,
+                class_fee=student.assigned_class,
+                month='january',
+                year=2025,
+                amount=3000,
+                status=status,
+                received_by=self.owner
+            )
+    
+    def test_list_query_count_is_constant(self):
+        self.assertConstantQueries('/api/payments/', self.add_payments)
+    
+    def test_outstanding_query_count_is_constant(self):
+        self.assertConstantQueries('/api/payments/outstanding/', self.add_payments)
+    
+    def test_monthly_income_query_count_is_constant(self):
+        self.assertConstantQueries(
+            '/api/payments/monthly-income/?month=january&year=2025',
+            lambda count: self.add_payments(count, status='paid')
+        )
+    
+    def test_export_streams_filtered_csv(self):
+        self.add_payments(2)
+        self.add_payments(1, status='paid')
+        Payment.objects.filter(status='paid').update(notes='=HYPERLINK("x")')
+        
+        response = self.client.get('/api/payments/export/?status=paid')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        rows = list(csv.reader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(rows[0][:3], ['ID', 'Student ID', 'Student'])
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][8], 'paid')
+        self.assertEqual(rows[1][12], '\'=HYPERLINK("x")')
+    
+    def test_export_writes_xlsx(self):
+        self.add_payments(3)
+        response = self.client.get('/api/payments/export/?file_type=xlsx')
+        self.assertEqual(response.status_code, 200)
+        
+        workbook = load_workbook(BytesIO(b''.join(response.streaming_content)), read_only=True)
+        rows = list(workbook.active.iter_rows(values_only=True))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[1][7], 3000)
+    
+    def test_monthly_income_is_cached_until_a_payment_changes(self):
+        url = '/api/payments/monthly-income/?month=january&year=2025'
+        self.add_payments(1, status='paid')
+        self.assertEqual(self.client.get(url).data['total_payments'], 1)
+        self.assertEqual(self.count_queries(url), 0)
+        
+        self.add_payments(1, status='paid')
+        self.assertEqual(self.client.get(url).data['total_payments'], 2)
+    
+    @override_settings(SMS_BACKEND='utils.sms.backends.locmem.SmsBackend')
+    def test_delivered_reminder_does_not_suppress_the_receipt(self):
+        sms.outbox.clear()
+        self.add_payments(3)
+        payment = Payment.objects.first()
+        
+        result = sweep_overdue(today=datetime.date(2025, 3, 1), grace_days=14, batch_size=2)
+        self.assertEqual(result, {'overdue': 3, 'reminders': 3})
+        call_command('process_outbox', window=0, stdout=StringIO())
+        self.assertEqual(len(sms.outbox), 3)
+        payment.refresh_from_db()
+        self.assertFalse(payment.sms_sent)
+        
+        response = self.client.patch(f'/api/payments/{payment.id}/', {'status': 'paid'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        receipt = OutboundMessage.objects.get(payment=payment, kind='receipt')
+        self.assertEqual(receipt.status, 'pending')
+        
+        call_command('process_outbox', window=0, stdout=StringIO())
+        payment.refresh_from_db()
+        self.assertTrue(payment.sms_sent)
+
+class GenerateInvoicesTests(APIFixtureTestCase):
+    def test_invoices_active_assigned_students_once(self):
+        billed = self.create_students(3)
+        inactive, unassigned = self.create_students(2)
+        Student.objects.filter(pk=inactive.pk).update(is_active=False)
+        Student.objects.filter(pk=unassigned.pk).update(assigned_class=None)
+        Payment.objects.create(
+            student=billed[0],
+            class_fee=billed[0].assigned_class,
+            month='march',
+            year=2025,
+            amount=3000,
+            status='paid'
+        )
+        
+        result = generate_invoices('march', 2025)
+        
+        self.assertEqual(result, {'month': 'march', 'year': 2025, 'students': 3, 'created': 2, 'skipped': 1})
+        self.assertEqual(
+            set(Payment.objects.filter(month='march', year=2025).values_list('student_id', flat=True)),
+            {student.id for student in billed}
+        )
+        self.assertEqual(Payment.objects.get(student=billed[0]).status, 'paid')
+        self.assertEqual(Payment.objects.filter(status='pending').count(), 2)
+    
+    def test_second_run_for_the_same_month_inserts_nothing(self):
+        self.create_students(4)
+        self.assertEqual(self.client.post('/api/payments/billing-run/', {'month': 'march', 'year': 2025}, format='json').data['created'], 4)
+        
+        response = self.client.post('/api/payments/billing-run/', {'month': 'march', 'year': 2025}, format='json')
+        self.assertEqual(response.data['created'], 0)
+        self.assertEqual(response.data['skipped'], 4)
+        self.assertEqual(Payment.objects.count(), 4)
+        self.assertEqual(generate_invoices('april', 2025, batch_size=3)['created'], 4)
+
+class SweepOverdueTests(APIFixtureTestCase):
+    def add_payment(self, student, month='january', status='pending'):
+        return Payment.objects.create(
+            student=student,
+            class_fee=student.assigned_class,
+            month=month,
+            year=2025,
+            amount=3000,
+            status=status
+        )
+    
+    def test_fee_is_overdue_only_after_the_grace_days(self):
+        payment = self.add_payment(self.create_students(1)[0])
+        
+        def stale(today):
+            return Payment.objects.filter(overdue_filter(today, 14)).exists()
+        
+        self.assertFalse(stale(datetime.date(2025, 1, 15)))
+        self.assertTrue(stale(datetime.date(2025, 1, 16)))
+        self.assertFalse(stale(datetime.date(2024, 12, 31)))
+        self.assertTrue(Payment.objects.filter(overdue_filter(datetime.date(2025, 2, 1), 0), pk=payment.pk).exists())
+    
+    def test_sweep_reports_and_marks_only_stale_pending_rows(self):
+        students = self.create_students(4)
+        stale = [self.add_payment(students[0]), self.add_payment(students[1])]
+        paid = self.add_payment(students[2], status='paid')
+        current = self.add_payment(students[3], month='february')
+        
+        result = sweep_overdue(today=datetime.date(2025, 2, 1), grace_days=14)
+        
+        self.assertEqual(result, {'overdue': 2, 'reminders': 2})
+        self.assertEqual(
+            set(Payment.objects.filter(status='overdue').values_list('id', flat=True)),
+            {p.id for p in stale}
+        )
+        self.assertEqual(Payment.objects.get(pk=paid.pk).status, 'paid')
+        self.assertEqual(Payment.objects.get(pk=current.pk).status, 'pending')
+        self.assertEqual(
+            set(OutboundMessage.objects.filter(kind='reminder').values_list('payment_id', flat=True)),
+            {p.id for p in stale}
+        )
+        self.assertEqual(sweep_overdue(today=datetime.date(2025, 2, 1), grace_days=14), {'overdue': 0, 'reminders': 0})
+    
+    def test_sweep_issues_one_update_however_many_reminder_batches(self):
+        for student in self.create_students(5):
+            self.add_payment(student)
+        
+        with CaptureQueriesContext(connection) as context:
+            result = sweep_overdue(today=datetime.date(2025, 3, 1), grace_days=14, batch_size=2)
+        
+        self.assertEqual(result, {'overdue': 5, 'reminders': 5})
+        sql = [q['sql'] for q in context.captured_queries]
+        self.assertEqual(len([q for q in sql if q.startswith('UPDATE "payments_payment"')]), 1)
+        self.assertEqual(len([q for q in sql if q.startswith('INSERT INTO "notifications_outboundmessage"')]), 3)
+
+class MonthlyIncomeRollupTests(APIFixtureTestCase):
+    def setUp(self):
+        super().setUp()
+        self.students = self.create_students(3)
+        self.payments = [
+            Payment.objects.create(
+                student=student,
+                class_fee=student.assigned_class,
+                month='january',
+                year=2025,
+                amount=3000,
+                status='paid'
+            )
+            for student in self.students
+        ]
+    
+    def assertRollupMatchesPayments(self):
+        expected = {
+            (row['class_fee'], row['month'], row['year']): (row['total'], row['count'])
+            for row in Payment.objects.filter(status='paid').order_by()
+            .values('class_fee', 'month', 'year').annotate(total=Sum('amount'), count=Count('id'))
+        }
+        actual = {
+            (row.class_fee_id, row.month, row.year): (row.total_amount, row.payment_count)
+            for row in MonthlyIncome.objects.all()
+            if row.payment_count
+        }
+        self.assertEqual(actual, expected)
+    
+    def test_rollup_follows_every_change_to_a_paid_payment(self):
+        payment = self.payments[0]
+        self.assertRollupMatchesPayments()
+        
+        payment.status = 'pending'
+        payment.save()
+        self.assertRollupMatchesPayments()
+        
+        payment.status = 'paid'
+        payment.amount = 4500
+        payment.save()
+        self.assertRollupMatchesPayments()
+        
+        payment.month = 'february'
+        payment.save()
+        self.assertRollupMatchesPayments()
+        
+        payment.class_fee = self.create_class()
+        payment.save()
+        self.assertRollupMatchesPayments()
+        
+        # A copy that was not loaded from the database reads the stored values first.
+        Payment(**{
+            field.attname: getattr(payment, field.attname) for field in Payment._meta.concrete_fields
+        } | {'amount': 5000}).save()
+        self.assertRollupMatchesPayments()
+        
+        self.payments[1].delete()
+        self.assertRollupMatchesPayments()
+    
+    def test_rebuild_restores_the_rollup_after_bulk_updates(self):
+        Payment.objects.filter(pk=self.payments[0].pk).update(amount=1000)
+        Payment.objects.filter(pk=self.payments[1].pk).update(status='pending')
+        
+        call_command('rebuild_income_rollup', stdout=StringIO())
+        
+        self.assertRollupMatchesPayments()
+        self.assertEqual(MonthlyIncome.objects.get().total_amount, 4000)
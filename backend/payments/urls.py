@@ -2,13 +2,17 @@ from django.urls import path
 from .views import (
     PaymentListCreateView, 
     PaymentDetailView, 
+    PaymentExportView,
     OutstandingPaymentsView,
-    MonthlyIncomeReportView
+    MonthlyIncomeReportView,
+    BillingRunView
 )
 
 urlpatterns = [
     path('', PaymentListCreateView.as_view(), name='payment-list-create'),
+    path('export/', PaymentExportView.as_view(), name='payment-export'),
     path('<int:pk>/', PaymentDetailView.as_view(), name='payment-detail'),
     path('outstanding/', OutstandingPaymentsView.as_view(), name='outstanding-payments'),
     path('monthly-income/', MonthlyIncomeReportView.as_view(), name='monthly-income'),
+    path('billing-run/', BillingRunView.as_view(), name='billing-run'),
 ]
@@ -1,14 +1,21 @@
 from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from django.db import transaction
 from django.utils import timezone
-from .models import Payment
-from .serializers import PaymentSerializer
-from utils.sms import send_payment_sms
+from .models import Payment, MonthlyIncome
+from .serializers import PaymentSerializer, BillingRunSerializer
+from .billing import current_period, generate_invoices
+from accounts.models import User
+from classes.models import Class
+from students.models import Student
+from utils.cache import CachedResponseMixin
+from utils.export import export_response, iter_rows
+from utils.sms import queue_payment_sms
 from accounts.permissions import IsOwner, IsOwnerOrTeacher
 
 class PaymentListCreateView(generics.ListCreateAPIView):
-    queryset = Payment.objects.all()
+    queryset = Payment.objects.for_api()
     serializer_class = PaymentSerializer
     
     def get_permissions(self):
@@ -17,19 +24,37 @@ class PaymentListCreateView(generics.ListCreateAPIView):
         return [IsOwnerOrTeacher()]
     
     def get_queryset(self):
-        queryset = Payment.objects.all()
-        student_id = self.request.query_params.get('student_id', None)
-        status = self.request.query_params.get('status', None)
-        
-        if student_id:
-            queryset = queryset.filter(student_id=student_id)
-        if status:
-            queryset = queryset.filter(status=status)
-        
-        return queryset
+        return Payment.objects.for_api().filter_params(self.request.query_params)
+
+class PaymentExportView(APIView):
+    """Stream payments as CSV, or XLSX with ``file_type=xlsx``."""
+    permission_classes = (IsOwnerOrTeacher,)
+    
+    columns = (
+        ('ID', 'id'),
+        ('Student ID', 'student_id'),
+        ('Student', 'student__full_name'),
+        ('Class ID', 'class_fee_id'),
+        ('Class', 'class_fee__name'),
+        ('Month', 'month'),
+        ('Year', 'year'),
+        ('Amount', 'amount'),
+        ('Status', 'status'),
+        ('Payment Date', 'payment_date'),
+        ('Received By', 'received_by__username'),
+        ('SMS Sent', 'sms_sent'),
+        ('Notes', 'notes'),
+        ('Created At', 'created_at'),
+    )
+    
+    def get(self, request):
+        queryset = Payment.objects.filter_params(request.query_params)
+        header = [label for label, _ in self.columns]
+        rows = iter_rows(queryset, [field for _, field in self.columns])
+        return export_response(request.query_params.get('file_type'), header, rows, 'payments')
 
 class PaymentDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Payment.objects.all()
+    queryset = Payment.objects.for_api()
     serializer_class = PaymentSerializer
     
     def get_permissions(self):
@@ -38,28 +63,29 @@ class PaymentDetailView(generics.RetrieveUpdateDestroyAPIView):
         return [IsOwner()]
     
     def perform_update(self, serializer):
-        instance = serializer.save()
-        
-        if instance.status == 'paid' and not instance.sms_sent:
-            sms_sent = send_payment_sms(
-                instance.student, 
-                instance.get_month_display(), 
-                instance.year
-            )
-            instance.sms_sent = sms_sent
-            instance.save()
+        with transaction.atomic():
+            instance = serializer.save()
+            
+            if (instance.status == 'paid' and not instance.sms_sent
+                    and not instance.outbound_messages.filter(kind='receipt').exists()):
+                queue_payment_sms(instance)
 
-class OutstandingPaymentsView(APIView):
+class OutstandingPaymentsView(CachedResponseMixin, generics.ListAPIView):
+    serializer_class = PaymentSerializer
     permission_classes = (IsOwnerOrTeacher,)
+    cache_models = (Payment, Student, Class, User)
     
-    def get(self, request):
-        outstanding = Payment.objects.filter(status__in=['pending', 'overdue'])
-        return Response(PaymentSerializer(outstanding, many=True).data)
+    def get_queryset(self):
+        return Payment.objects.for_api().outstanding()
 
-class MonthlyIncomeReportView(APIView):
+class MonthlyIncomeReportView(CachedResponseMixin, APIView):
     permission_classes = (IsOwnerOrTeacher,)
+    cache_models = (Payment, MonthlyIncome, Class)
     
     def get(self, request):
+        return self.cached_response(request, lambda: self.report(request))
+    
+    def report(self, request):
         month = request.query_params.get('month')
         year = request.query_params.get('year')
         
@@ -69,18 +95,40 @@ class MonthlyIncomeReportView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        payments = Payment.objects.filter(
+        rollups = MonthlyIncome.objects.filter(
             month=month.lower(),
             year=int(year),
-            status='paid'
-        )
+            payment_count__gt=0
+        ).select_related('class_fee').order_by('class_fee__name')
         
-        total_income = sum([p.amount for p in payments])
+        classes = [
+            {
+                'class_id': r.class_fee_id,
+                'class_name': r.class_fee.name,
+                'total_payments': r.payment_count,
+                'total_income': r.total_amount
+            }
+            for r in rollups
+        ]
         
         return Response({
             'month': month,
             'year': year,
-            'total_payments': payments.count(),
-            'total_income': total_income,
-            'payments': PaymentSerializer(payments, many=True).data
+            'total_payments': sum(c['total_payments'] for c in classes),
+            'total_income': sum(c['total_income'] for c in classes),
+            'classes': classes
         })
+
+class BillingRunView(APIView):
+    permission_classes = (IsOwner,)
+    
+    def post(self, request):
+        serializer = BillingRunSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        month, year = current_period()
+        result = generate_invoices(
+            serializer.validated_data.get('month', month),
+            serializer.validated_data.get('year', year)
+        )
+        return Response(result, status=status.HTTP_200_OK)
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class StudentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'students'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
+        from utils.cache import watch_model
+        watch_model(self.get_model('Student'))
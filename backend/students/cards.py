@@ -0,0 +1,113 @@
+import zlib
+from django.conf import settings
+from PIL import Image, ImageDraw, ImageFont
+from .models import Student
+from .qr import qr_payload, write_qr_image
+
+# A4 at 150 DPI, three columns by four rows of cards.
+PAGE_SIZE = (1240, 1754)
+PAGE_POINTS = (595, 842)
+COLUMNS = 3
+ROWS = 4
+MARGIN = 60
+QR_SIZE = 280
+CARD_WIDTH = (PAGE_SIZE[0] - 2 * MARGIN) // COLUMNS
+CARD_HEIGHT = (PAGE_SIZE[1] - 2 * MARGIN) // ROWS
+
+def render_card(student, font):
+    card = Image.new('L', (CARD_WIDTH, CARD_HEIGHT), 255)
+    draw = ImageDraw.Draw(card)
+    draw.rectangle([0, 0, CARD_WIDTH - 1, CARD_HEIGHT - 1], outline=160)
+    
+    # Built from the cached QR image; only a cache miss renders a new one.
+    path = settings.QR_CODE_DIR / write_qr_image(qr_payload(student), settings.QR_CODE_DIR)
+    with Image.open(path) as qr:
+        qr_image = qr.convert('L').resize((QR_SIZE, QR_SIZE), Image.NEAREST)
+    card.paste(qr_image, ((CARD_WIDTH - QR_SIZE) // 2, 20))
+    
+    lines = [student.full_name, student.assigned_class.name if student.assigned_class else '', f'ID: {student.id}']
+    y = QR_SIZE + 35
+    for line in lines:
+        text_width = draw.textlength(line, font=font)
+        draw.text(((CARD_WIDTH - text_width) / 2, y), line, fill=0, font=font)
+        y += 24
+    return card
+
+def card_students(class_id=None):
+    students = Student.objects.filter(is_active=True).select_related('assigned_class').order_by('assigned_class__name', 'full_name')
+    if class_id:
+        students = students.filter(assigned_class_id=class_id)
+    return students.iterator(chunk_size=200)
+
+def iter_card_pages(students):
+    """Yield one page image at a time for an iterable of students."""
+    font = ImageFont.load_default()
+    per_page = COLUMNS * ROWS
+    
+    page = None
+    slot = 0
+    for student in students:
+        if page is None:
+            page = Image.new('L', PAGE_SIZE, 255)
+        column, row = slot % COLUMNS, slot // COLUMNS
+        page.paste(render_card(student, font), (MARGIN + column * CARD_WIDTH, MARGIN + row * CARD_HEIGHT))
+        slot += 1
+        if slot == per_page:
+            yield page
+            page, slot = None, 0
+    
+    if page is not None:
+        yield page
+
+def stream_pdf(pages):
+    """Write a PDF incrementally, yielding bytes as each page is finished.
+    
+    Object 1 is the catalog and object 2 the page tree; the page tree is
+    written last, once every page object number is known.
+    """
+    offsets = {}
+    position = 0
+    page_ids = []
+    next_id = 3
+    
+    def emit(obj_id, body):
+        nonlocal position
+        offsets[obj_id] = position
+        chunk = f'{obj_id} 0 obj\n'.encode() + body + b'\nendobj\n'
+        position += len(chunk)
+        return chunk
+    
+    header = b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n'
+    position += len(header)
+    yield header
+    yield emit(1, b'<< /Type /Catalog /Pages 2 0 R >>')
+    
+    for page in pages:
+        image_id, content_id, page_id = next_id, next_id + 1, next_id + 2
+        next_id += 3
+        
+        data = zlib.compress(page.tobytes())
+        yield emit(image_id, (
+            f'<< /Type /XObject /Subtype /Image /Width {page.width} /Height {page.height} '
+            f'/ColorSpace /DeviceGray /BitsPerComponent 8 /Filter /FlateDecode /Length {len(data)} >>\n'
+            'stream\n'
+        ).encode() + data + b'\nendstream')
+        
+        content = f'q {PAGE_POINTS[0]} 0 0 {PAGE_POINTS[1]} 0 0 cm /Im0 Do Q'.encode()
+        yield emit(content_id, f'<< /Length {len(content)} >>\nstream\n'.encode() + content + b'\nendstream')
+        
+        yield emit(page_id, (
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_POINTS[0]} {PAGE_POINTS[1]}] '
+            f'/Resources << /XObject << /Im0 {image_id} 0 R >> >> /Contents {content_id} 0 R >>'
+        ).encode())
+        page_ids.append(page_id)
+    
+    kids = ' '.join(f'{page_id} 0 R' for page_id in page_ids)
+    yield emit(2, f'<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>'.encode())
+    
+    xref_position = position
+    xref = [f'xref\n0 {next_id}\n', '0000000000 65535 f \n']
+    for obj_id in range(1, next_id):
+        xref.append(f'{offsets[obj_id]:010d} 00000 n \n')
+    xref.append(f'trailer\n<< /Size {next_id} /Root 1 0 R >>\nstartxref\n{xref_position}\n%%EOF\n')
+    yield ''.join(xref).encode()
@@ -0,0 +1,113 @@
+import csv
+import datetime
+import re
+import threading
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from classes.models import Class
+from utils.cache import invalidate_models
+from .models import Student
+from .qr import qr_payload, qr_storage_name, write_qr_image
+
+COLUMNS = ('full_name', 'date_of_birth', 'parent_name', 'parent_phone', 'parent_email', 'address', 'assigned_class')
+REQUIRED_COLUMNS = ('full_name', 'date_of_birth', 'parent_name', 'parent_phone', 'address')
+PHONE_RE = re.compile(r'^\+?\d{9,14}$')
+PHONE_SEPARATORS = re.compile(r'[\s\-()]')
+
+def _class_ids(names):
+    """Map class names to ids with one query; ambiguous names map to ``None``."""
+    ids = {}
+    for name, class_id in Class.objects.filter(name__in=names).values_list('name', 'id'):
+        ids[name] = None if name in ids else class_id
+    return ids
+
+def _clean_row(row, class_ids):
+    values = {column: (row.get(column) or '').strip() for column in COLUMNS}
+    errors = {}
+    
+    for column in REQUIRED_COLUMNS:
+        if not values[column]:
+            errors[column] = 'This field is required.'
+    for column in ('full_name', 'parent_name'):
+        if len(values[column]) > 200:
+            errors[column] = 'Ensure this field has no more than 200 characters.'
+    
+    if values['date_of_birth']:
+        try:
+            values['date_of_birth'] = datetime.date.fromisoformat(values['date_of_birth'])
+        except ValueError:
+            errors['date_of_birth'] = 'Use the YYYY-MM-DD format.'
+    
+    if values['parent_phone']:
+        values['parent_phone'] = PHONE_SEPARATORS.sub('', values['parent_phone'])
+        if not PHONE_RE.match(values['parent_phone']):
+            errors['parent_phone'] = 'Enter a phone number such as +94771234567.'
+    
+    if values['parent_email']:
+        try:
+            validate_email(values['parent_email'])
+        except ValidationError:
+            errors['parent_email'] = 'Enter a valid email address.'
+    
+    class_name = values.pop('assigned_class')
+    values['assigned_class_id'] = None
+    if class_name:
+        if class_name not in class_ids:
+            errors['assigned_class'] = f'No class named "{class_name}".'
+        elif class_ids[class_name] is None:
+            errors['assigned_class'] = f'More than one class is named "{class_name}".'
+        else:
+            values['assigned_class_id'] = class_ids[class_name]
+    
+    return values, errors
+
+def render_qr_images(payloads):
+    directory = str(settings.QR_CODE_DIR)
+    for payload in payloads:
+        write_qr_image(payload, directory)
+
+def import_students(lines, dry_run=False, batch_size=500, render_in_background=True):
+    """Validate and insert students from CSV ``lines`` in one transaction.
+    
+    The header must name the ``COLUMNS``; ``assigned_class`` holds a class
+    name. Nothing is inserted unless every row is valid. Row numbers in the
+    returned errors count the header as row 1. QR images are rendered in a
+    background thread once the transaction commits, unless
+    ``render_in_background`` is false and the caller renders them itself.
+    """
+    reader = csv.DictReader(lines)
+    missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or ())]
+    if missing:
+        return {'rows': 0, 'created': 0, 'errors': [{'row': 1, 'errors': {c: 'Missing column.' for c in missing}}]}
+    
+    rows = list(reader)
+    class_ids = _class_ids({(row.get('assigned_class') or '').strip() for row in rows} - {''})
+    
+    students, errors = [], []
+    for number, row in enumerate(rows, start=2):
+        values, row_errors = _clean_row(row, class_ids)
+        if row_errors:
+            errors.append({'row': number, 'errors': row_errors})
+        else:
+            students.append(Student(**values))
+    
+    if errors or dry_run:
+        return {'rows': len(rows), 'created': 0, 'errors': errors}
+    
+    with transaction.atomic():
+        Student.objects.bulk_create(students, batch_size=batch_size)
+        # The file name follows from the id, so it can be set before the image exists.
+        for student in students:
+            student.qr_code.name = qr_storage_name(student)
+        Student.objects.bulk_update(students, ['qr_code'], batch_size=batch_size)
+        invalidate_models(Student)
+        
+        if render_in_background:
+            payloads = [qr_payload(student) for student in students]
+            transaction.on_commit(lambda: threading.Thread(
+                target=render_qr_images, args=(payloads,), daemon=True
+            ).start())
+    
+    return {'rows': len(rows), 'created': len(students), 'errors': []}
@@ -0,0 +1,34 @@
+import os
+from django.core.management.base import BaseCommand
+from students.cards import card_students, iter_card_pages, stream_pdf
+
+class Command(BaseCommand):
+    help = 'Export printable student QR cards as a multi-page PDF or PNG sheets.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='PDF file, or a directory for --format png.')
+        parser.add_argument('--class-id', type=int, help='Only export students in this class.')
+        parser.add_argument('--format', choices=['pdf', 'png'], default='pdf')
+    
+    def handle(self, *args, **options):
+        output = options['output']
+        count = 0
+        
+        def counted(pages):
+            nonlocal count
+            for page in pages:
+                count += 1
+                yield page
+        
+        pages = counted(iter_card_pages(card_students(options['class_id'])))
+        
+        if options['format'] == 'png':
+            os.makedirs(output, exist_ok=True)
+            for page in pages:
+                page.save(os.path.join(output, f'qr_cards_{count:03d}.png'))
+        else:
+            with open(output, 'wb') as f:
+                for chunk in stream_pdf(pages):
+                    f.write(chunk)
+        
+        self.stdout.write(self.style.SUCCESS(f'Wrote {count} page(s) to {output}.'))
@@ -0,0 +1,27 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from students.importer import import_students
+
+class Command(BaseCommand):
+    help = 'Import students from a CSV file; nothing is saved unless every row is valid.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file with a header row.')
+        parser.add_argument('--dry-run', action='store_true', help='Validate without saving.')
+    
+    def handle(self, *args, **options):
+        with open(options['path'], encoding='utf-8-sig', newline='') as f:
+            result = import_students(f, dry_run=options['dry_run'], render_in_background=False)
+        
+        for error in result['errors']:
+            details = '; '.join(f'{field}: {message}' for field, message in error['errors'].items())
+            self.stderr.write(f"Row {error['row']}: {details}")
+        if result['errors']:
+            raise CommandError(f"{len(result['errors'])} invalid row(s); nothing was imported.")
+        
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"{result['rows']} row(s) are valid."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Imported {result['created']} student(s)."))
+            # The process exits when we return, so render the QR images now.
+            call_command('render_qr_codes', stdout=self.stdout)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from students.roster import prune_tombstones
+
+class Command(BaseCommand):
+    help = (
+        'Delete deleted-student tombstones older than ROSTER_TOMBSTONE_RETENTION days. '
+        'Safe to run periodically, e.g. daily from cron.'
+    )
+    
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS(f'Pruned {prune_tombstones()} tombstone(s).'))
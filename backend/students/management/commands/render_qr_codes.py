@@ -0,0 +1,50 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from students.models import Student
+from students.qr import QR_UPLOAD_DIR, qr_filename, qr_payload, write_qr_image
+
+class Command(BaseCommand):
+    help = 'Render missing student QR code images in parallel.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count(),
+            help='Number of worker processes.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=50,
+            help='Payloads handed to a worker process at a time.'
+        )
+    
+    def handle(self, *args, **options):
+        directory = str(settings.QR_CODE_DIR)
+        students = list(Student.objects.only('id', 'full_name', 'qr_code'))
+        
+        missing = {}
+        for student in students:
+            payload = qr_payload(student)
+            if not os.path.exists(os.path.join(directory, qr_filename(payload))):
+                missing[payload] = student
+        
+        if missing:
+            with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+                list(pool.map(
+                    partial(write_qr_image, directory=directory),
+                    missing,
+                    chunksize=options['chunk_size']
+                ))
+        
+        stale = []
+        for student in students:
+            name = f'{QR_UPLOAD_DIR}/{qr_filename(qr_payload(student))}'
+            if student.qr_code.name != name:
+                student.qr_code.name = name
+                stale.append(student)
+        Student.objects.bulk_update(stale, ['qr_code'], batch_size=500)
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'Rendered {len(missing)} QR image(s), updated {len(stale)} student(s).'
+        ))
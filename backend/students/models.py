@@ -1,10 +1,19 @@
-from django.db import models
-from django.conf import settings
-import qrcode
-from io import BytesIO
-from django.core.files import File
-from PIL import Image
-import os
+from django.db import connection, models
+from .qr import ensure_qr_code
+
+class StudentQuerySet(models.QuerySet):
+    def for_api(self):
+        return self.select_related('assigned_class')
+    
+    def lock(self):
+        """Row-lock these students until the current transaction ends.
+        
+        Attendance writers take it so their duplicate checks see each other's
+        rows. SQLite has no row locks, and the tuned backend's ``BEGIN
+        IMMEDIATE`` already serializes writers, so nothing is queried there.
+        """
+        if connection.features.has_select_for_update:
+            list(self.select_for_update().order_by('pk').values_list('pk', flat=True))
 
 class Student(models.Model):
     full_name = models.CharField(max_length=200)
@@ -24,35 +33,20 @@ class Student(models.Model):
     enrollment_date = models.DateField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    
+    objects = StudentQuerySet.as_manager()
     
     def __str__(self):
         return self.full_name
     
     def generate_qr_code(self):
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr_data = f"STUDENT:{self.id}:{self.full_name}"
-        qr.add_data(qr_data)
-        qr.make(fit=True)
-        
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        buffer = BytesIO()
-        img.save(buffer, 'PNG')
-        buffer.seek(0)
-        
-        filename = f'student_{self.id}_qr.png'
-        self.qr_code.save(filename, File(buffer), save=False)
-        buffer.close()
+        ensure_qr_code(self, save=False)
+
+class StudentTombstone(models.Model):
+    """Records a deleted student so roster deltas can tell tablets to drop it."""
+    student_id = models.IntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
     
-    def save(self, *args, **kwargs):
-        is_new = self.pk is None
-        super().save(*args, **kwargs)
-        if is_new or not self.qr_code:
-            self.generate_qr_code()
-            super().save(update_fields=['qr_code'])
+    def __str__(self):
+        return f"Student {self.student_id} deleted"
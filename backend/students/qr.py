@@ -0,0 +1,70 @@
+import hashlib
+import os
+import tempfile
+from io import BytesIO
+from django.conf import settings
+import qrcode
+
+QR_UPLOAD_DIR = 'qr_codes'
+
+def qr_payload(student):
+    return f"STUDENT:{student.id}:{student.full_name}"
+
+def qr_filename(payload):
+    digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+    return f'qr_{digest}.png'
+
+def render_qr_png(payload):
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=4,
+    )
+    qr.add_data(payload)
+    qr.make(fit=True)
+    
+    img = qr.make_image(fill_color="black", back_color="white")
+    
+    buffer = BytesIO()
+    img.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+def write_qr_image(payload, directory):
+    """Render ``payload`` into ``directory`` unless it is already cached there.
+    
+    Files are named after the payload hash, so an unchanged payload is never
+    rendered twice. Returns the file name. Safe to call from worker processes.
+    """
+    filename = qr_filename(payload)
+    path = os.path.join(directory, filename)
+    if os.path.exists(path):
+        return filename
+    
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(render_qr_png(payload))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return filename
+
+def qr_storage_name(student):
+    return f'{QR_UPLOAD_DIR}/{qr_filename(qr_payload(student))}'
+
+def ensure_qr_code(student, save=True):
+    """Point ``student.qr_code`` at a cached image of its current payload.
+    
+    The image is rendered on a cache miss. When ``save`` is true a changed
+    file name is written back with a single ``UPDATE``.
+    """
+    filename = write_qr_image(qr_payload(student), settings.QR_CODE_DIR)
+    name = f'{QR_UPLOAD_DIR}/{filename}'
+    
+    if student.qr_code.name != name:
+        student.qr_code.name = name
+        if save and student.pk:
+            type(student).objects.filter(pk=student.pk).update(qr_code=name)
+    return student.qr_code
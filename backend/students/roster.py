@@ -0,0 +1,54 @@
+import datetime
+from django.conf import settings
+from django.utils import timezone
+from .models import Student, StudentTombstone
+
+ROSTER_FIELDS = ('id', 'full_name', 'assigned_class', 'is_active')
+
+def version_from_time(value):
+    return str(int(value.timestamp() * 1_000_000))
+
+def time_from_version(version):
+    """Parse a ``since`` version; raises ``ValueError`` if it is malformed."""
+    return datetime.datetime.fromtimestamp(int(version) / 1_000_000, tz=datetime.timezone.utc)
+
+def tombstone_cutoff():
+    """Oldest ``since`` a delta can answer; older tombstones may be pruned."""
+    return timezone.now() - datetime.timedelta(days=settings.ROSTER_TOMBSTONE_RETENTION)
+
+def prune_tombstones():
+    """Delete tombstones past the retention period; returns how many were removed."""
+    return StudentTombstone.objects.filter(deleted_at__lt=tombstone_cutoff()).delete()[0]
+
+def roster_changes(since=None):
+    """Return the roster, or only what changed at or after ``since``.
+    
+    Tablets store ``version`` and pass it back as ``since`` on the next
+    sync. Students are upserts keyed by id; ``deleted`` lists removed ids.
+    A ``since`` older than the tombstone retention gets the full roster.
+    
+    ``version`` trails the sync by ``ROSTER_SYNC_OVERLAP`` seconds, so rows
+    are re-sent for that long. A save whose transaction commits after this
+    read is still in the next delta as long as it committed within the
+    overlap of stamping ``updated_at``.
+    """
+    version = version_from_time(timezone.now() - datetime.timedelta(seconds=settings.ROSTER_SYNC_OVERLAP))
+    students = Student.objects.order_by('id')
+    deleted = []
+    
+    if since is not None and since < tombstone_cutoff():
+        since = None
+    if since is not None:
+        students = students.filter(updated_at__gte=since)
+        deleted = list(
+            StudentTombstone.objects.filter(deleted_at__gte=since)
+            .values_list('student_id', flat=True)
+            .distinct()
+        )
+    
+    return {
+        'version': version,
+        'full': since is None,
+        'students': list(students.values(*ROSTER_FIELDS)),
+        'deleted': deleted,
+    }
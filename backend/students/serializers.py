@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from .models import Student
 from classes.models import Class
+from .qr import ensure_qr_code
+from utils.serializers import DynamicFieldsMixin
 
-class StudentSerializer(serializers.ModelSerializer):
+class StudentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class_name = serializers.CharField(source='assigned_class.name', read_only=True, allow_null=True)
     qr_code = serializers.SerializerMethodField()
     qr_code_url = serializers.SerializerMethodField()
@@ -14,15 +16,19 @@ class StudentSerializer(serializers.ModelSerializer):
                   'qr_code', 'qr_code_url', 'enrollment_date', 'is_active', 'created_at']
         read_only_fields = ['id', 'qr_code', 'qr_code_url', 'enrollment_date', 'created_at']
     
+    def to_representation(self, instance):
+        # Renders the image on first access; later calls hit the disk cache.
+        # The URL follows from the payload, so reads never write to the row.
+        # Both URL fields share one lookup per row.
+        if 'qr_code' in self.fields or 'qr_code_url' in self.fields:
+            self._qr_code_url = ensure_qr_code(instance, save=False).url
+        return super().to_representation(instance)
+    
     def get_qr_code(self, obj):
-        if obj.qr_code:
-            return obj.qr_code.url
-        return None
+        return self._qr_code_url
     
     def get_qr_code_url(self, obj):
-        if obj.qr_code:
-            return obj.qr_code.url
-        return None
+        return self._qr_code_url
 
 class StudentCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from classes.models import Class
+from .models import Student, StudentTombstone
+
+@receiver(post_delete, sender=Student)
+def record_tombstone(sender, instance, **kwargs):
+    StudentTombstone.objects.create(student_id=instance.pk)
+
+@receiver(pre_delete, sender=Class)
+def touch_class_students(sender, instance, **kwargs):
+    # Deleting a class nulls assigned_class with a plain UPDATE that leaves
+    # updated_at alone; bump it so roster deltas pick the change up.
+    Student.objects.filter(assigned_class_id=instance.pk).update(updated_at=timezone.now())
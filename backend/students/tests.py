@@ -1,3 +1,152 @@
-from django.test import TestCase
+import datetime
+import re
+import time
+from unittest import mock
+from io import StringIO
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from students import serializers
+from students.models import Student, StudentTombstone
+from students.roster import version_from_time
+from utils.testing import APIFixtureTestCase, ListQueryCountTestCase
 
-# Create your tests here.
+class StudentListQueryCountTests(ListQueryCountTestCase):
+    def test_list_query_count_is_constant(self):
+        self.assertConstantQueries('/api/students/', self.create_students)
+    
+    def test_qr_image_is_resolved_once_per_row(self):
+        self.create_students(3)
+        with mock.patch.object(serializers, 'ensure_qr_code', wraps=serializers.ensure_qr_code) as ensure:
+            rows = self.client.get('/api/students/').data
+        self.assertEqual(ensure.call_count, 3)
+        self.assertTrue(all(row['qr_code'] == row['qr_code_url'] for row in rows))
+
+class StudentImportTests(APIFixtureTestCase):
+    HEADER = 'full_name,date_of_birth,parent_name,parent_phone,parent_email,address,assigned_class\n'
+    
+    def upload(self, rows, **data):
+        csv_file = SimpleUploadedFile('students.csv', (self.HEADER + ''.join(rows)).encode(), 'text/csv')
+        return self.client.post('/api/students/import/', {'file': csv_file, **data}, format='multipart')
+    
+    def test_import_creates_students_in_bulk(self):
+        assigned_class = self.create_class()
+        rows = [
+            f'Student {i},2012-05-0{i % 9 + 1},Parent {i},+94 77 {i:07d},,Colombo,{assigned_class.name}\n'
+            for i in range(2000)
+        ]
+        
+        started = time.perf_counter()
+        with CaptureQueriesContext(connection) as context:
+            response = self.upload(rows)
+        self.assertLess(time.perf_counter() - started, 10)
+        
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 2000)
+        self.assertLess(len(context.captured_queries), 50)
+        student = Student.objects.get(full_name='Student 7')
+        self.assertEqual(student.assigned_class, assigned_class)
+        self.assertEqual(student.parent_phone, '+94770000007')
+        self.assertTrue(student.qr_code.name.startswith('qr_codes/qr_'))
+    
+    def test_invalid_rows_are_reported_and_nothing_is_saved(self):
+        response = self.upload([
+            'Good Student,2012-01-01,Parent,+94771234567,,Colombo,\n',
+            'Bad Student,01/01/2012,Parent,12ab,not-an-email,Colombo,Missing Class\n',
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'], [{'row': 3, 'errors': {
+            'date_of_birth': 'Use the YYYY-MM-DD format.',
+            'parent_phone': 'Enter a phone number such as +94771234567.',
+            'parent_email': 'Enter a valid email address.',
+            'assigned_class': 'No class named "Missing Class".',
+        }}])
+        self.assertFalse(Student.objects.exists())
+
+class QRCardSheetTests(APIFixtureTestCase):
+    def get_pdf(self):
+        response = self.client.get('/api/students/qr-cards/')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        return b''.join(response.streaming_content)
+    
+    def test_sheet_is_a_complete_pdf_with_one_page_per_twelve_cards(self):
+        assigned_class = self.create_class()
+        self.create_students(12, assigned_class)
+        self.assertEqual(len(re.findall(rb'/Type /Page\b(?!s)', self.get_pdf())), 1)
+        
+        self.create_students(1, assigned_class)
+        pdf = self.get_pdf()
+        
+        self.assertTrue(pdf.startswith(b'%PDF-1.4\n'))
+        self.assertTrue(pdf.endswith(b'%%EOF\n'))
+        self.assertEqual(len(re.findall(rb'/Type /Page\b(?!s)', pdf)), 2)
+        self.assertIn(b'/Count 2 >>', pdf)
+        
+        # Every cross-reference entry points at the object it names.
+        startxref = int(pdf.rsplit(b'startxref\n', 1)[1].split(b'\n')[0])
+        self.assertTrue(pdf[startxref:].startswith(b'xref\n'))
+        entries = re.findall(rb'^(\d{10}) 00000 n $', pdf[startxref:], re.M)
+        self.assertEqual(len(entries), 8)
+        for obj_id, offset in enumerate(entries, start=1):
+            self.assertTrue(pdf[int(offset):].startswith(f'{obj_id} 0 obj'.encode()))
+
+class StudentRosterTests(APIFixtureTestCase):
+    def test_delta_returns_changes_and_deletions_since_version(self):
+        first, second, third = self.create_students(3)
+        snapshot = self.client.get('/api/students/roster/').data
+        self.assertTrue(snapshot['full'])
+        self.assertEqual([s['id'] for s in snapshot['students']], [first.id, second.id, third.id])
+        
+        first.is_active = False
+        first.save()
+        second_id = second.id
+        second.delete()
+        
+        delta = self.client.get(f"/api/students/roster/?since={snapshot['version']}").data
+        self.assertFalse(delta['full'])
+        self.assertEqual(delta['deleted'], [second_id])
+        changed = {s['id']: s for s in delta['students']}
+        self.assertFalse(changed[first.id]['is_active'])
+        self.assertNotIn(second_id, changed)
+    
+    def test_class_deletion_reaches_the_delta(self):
+        student = self.create_students(1)[0]
+        version = self.client.get('/api/students/roster/').data['version']
+        Student.objects.filter(pk=student.pk).update(updated_at='2000-01-01T00:00:00Z')
+        
+        student.assigned_class.delete()
+        delta = self.client.get(f'/api/students/roster/?since={version}').data
+        self.assertEqual(delta['students'], [
+            {'id': student.id, 'full_name': student.full_name, 'assigned_class': None, 'is_active': True}
+        ])
+    
+    def test_invalid_version_is_rejected(self):
+        self.assertEqual(self.client.get('/api/students/roster/?since=abc').status_code, 400)
+    
+    def test_version_older_than_tombstone_retention_gets_the_full_roster(self):
+        students = self.create_students(2)
+        stale = version_from_time(timezone.now() - datetime.timedelta(days=31))
+        
+        with self.settings(ROSTER_TOMBSTONE_RETENTION=30):
+            delta = self.client.get(f'/api/students/roster/?since={stale}').data
+            recent = self.client.get(f"/api/students/roster/?since={delta['version']}").data
+        
+        self.assertTrue(delta['full'])
+        self.assertEqual([s['id'] for s in delta['students']], [s.id for s in students])
+        self.assertFalse(recent['full'])
+    
+    def test_prune_removes_only_expired_tombstones(self):
+        old_id, recent_id = (student.id for student in self.create_students(2))
+        Student.objects.filter(id__in=[old_id, recent_id]).delete()
+        StudentTombstone.objects.filter(student_id=old_id).update(
+            deleted_at=timezone.now() - datetime.timedelta(days=31)
+        )
+        
+        with self.settings(ROSTER_TOMBSTONE_RETENTION=30):
+            out = StringIO()
+            call_command('prune_roster_tombstones', stdout=out)
+        
+        self.assertIn('Pruned 1 tombstone(s).', out.getvalue())
+        self.assertEqual(list(StudentTombstone.objects.values_list('student_id', flat=True)), [recent_id])
@@ -1,7 +1,10 @@
 from django.urls import path
-from .views import StudentListCreateView, StudentDetailView
+from .views import StudentListCreateView, StudentDetailView, QRCardSheetView, StudentImportView, StudentRosterView
 
 urlpatterns = [
     path('', StudentListCreateView.as_view(), name='student-list-create'),
     path('<int:pk>/', StudentDetailView.as_view(), name='student-detail'),
+    path('roster/', StudentRosterView.as_view(), name='student-roster'),
+    path('import/', StudentImportView.as_view(), name='student-import'),
+    path('qr-cards/', QRCardSheetView.as_view(), name='student-qr-cards'),
 ]
@@ -1,10 +1,19 @@
-from rest_framework import generics, permissions
+import io
+from django.http import StreamingHttpResponse
+from rest_framework import generics, permissions, status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from .models import Student
 from .serializers import StudentSerializer, StudentCreateSerializer
+from .cards import card_students, iter_card_pages, stream_pdf
+from .importer import import_students
+from .roster import roster_changes, time_from_version
 from accounts.permissions import IsOwner, IsOwnerOrTeacher
 
 class StudentListCreateView(generics.ListCreateAPIView):
-    queryset = Student.objects.all()
+    queryset = Student.objects.for_api()
+    pagination_ordering = ['id']
     
     def get_permissions(self):
         if self.request.method == 'POST':
@@ -17,10 +26,56 @@ class StudentListCreateView(generics.ListCreateAPIView):
         return StudentSerializer
 
 class StudentDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Student.objects.all()
+    queryset = Student.objects.for_api()
     serializer_class = StudentSerializer
     
     def get_permissions(self):
         if self.request.method in ['GET']:
             return [IsOwnerOrTeacher()]
         return [IsOwner()]
+
+class StudentRosterView(APIView):
+    """Roster feed for scanner tablets; pass the returned ``version`` back as ``since``."""
+    permission_classes = (IsOwnerOrTeacher,)
+    
+    def get(self, request):
+        since = request.query_params.get('since')
+        if since:
+            try:
+                since = time_from_version(since)
+            except (ValueError, OverflowError, OSError):
+                return Response({'error': 'Invalid since version'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(roster_changes(since or None))
+
+class QRCardSheetView(APIView):
+    permission_classes = (IsOwnerOrTeacher,)
+    
+    def get(self, request):
+        class_id = request.query_params.get('class_id', None)
+        pages = iter_card_pages(card_students(class_id))
+        
+        response = StreamingHttpResponse(stream_pdf(pages), content_type='application/pdf')
+        response['Content-Disposition'] = 'attachment; filename="student-qr-cards.pdf"'
+        return response
+
+class StudentImportView(APIView):
+    """Enrol students from an uploaded CSV ``file``; see ``students.importer``."""
+    permission_classes = (IsOwner,)
+    parser_classes = (MultiPartParser,)
+    
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'A CSV file is required'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        dry_run = request.data.get('dry_run', '').lower() in ('1', 'true')
+        lines = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        try:
+            result = import_students(lines, dry_run=dry_run)
+        except UnicodeDecodeError:
+            return Response({'error': 'The file must be UTF-8 encoded'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if result['errors']:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED)
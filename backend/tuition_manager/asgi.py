@@ -2,6 +2,8 @@
 ASGI config for tuition_manager project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The live dashboard feed (``/api/live/feed/``) is only served through this
+app, e.g. ``uvicorn tuition_manager.asgi:application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -0,0 +1,57 @@
+"""
+SQLite backend tuned for several scanners writing at once.
+
+Every new connection switches to WAL journaling, so readers never block the
+writer, and applies the ``pragmas`` given in the database ``OPTIONS``: a dict,
+or a ``name:value,name:value`` string as it arrives from a ``DATABASE_URL``
+query. Lock waits are governed by the ``timeout`` option alone.
+Transactions start with ``BEGIN IMMEDIATE``: a deferred transaction that
+reads first and then writes cannot wait on the busy timeout and fails with
+"database is locked" instead.
+"""
+import re
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'foreign_keys': 'ON',
+}
+PRAGMA_NAME = re.compile(r'^[a-z_]+$')
+PRAGMA_VALUE = re.compile(r'^-?\w+$')
+
+def parse_pragmas(value):
+    """Return ``value`` as a validated ``{name: value}`` dict."""
+    if isinstance(value, str):
+        try:
+            value = dict(item.split(':', 1) for item in value.split(',') if item)
+        except ValueError:
+            raise ImproperlyConfigured(f"SQLite pragmas must look like 'name:value,name:value', got {value!r}")
+    if not isinstance(value, dict):
+        raise ImproperlyConfigured('SQLite pragmas must be a dict or a string.')
+    
+    pragmas = {}
+    for name, setting in value.items():
+        name, setting = str(name).strip().lower(), str(setting).strip()
+        if not PRAGMA_NAME.match(name) or not PRAGMA_VALUE.match(setting):
+            raise ImproperlyConfigured(f'Invalid SQLite pragma: {name} = {setting}')
+        if name == 'busy_timeout':
+            raise ImproperlyConfigured("Set the lock wait with the 'timeout' option instead of busy_timeout.")
+        pragmas[name] = setting
+    return pragmas
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        self.pragmas = {**DEFAULT_PRAGMAS, **parse_pragmas(kwargs.pop('pragmas', {}))}
+        return kwargs
+    
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+    
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute('BEGIN IMMEDIATE')
@@ -0,0 +1,51 @@
+from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+from tuition_manager.backends.sqlite3.base import DatabaseWrapper, parse_pragmas
+from tuition_manager.database import database_config
+from utils.metrics import registry
+from utils.testing import APIFixtureTestCase
+
+class RequestMetricsTests(APIFixtureTestCase):
+    def setUp(self):
+        super().setUp()
+        registry.reset()
+    
+    def test_responses_carry_server_timing(self):
+        self.create_students(2)
+        response = self.client.get('/api/students/')
+        timing = response['Server-Timing']
+        self.assertTrue(timing.startswith('app;dur='))
+        self.assertIn('db;dur=', timing)
+        self.assertIn('serialize;dur=', timing)
+    
+    def test_metrics_endpoint_serves_histograms_to_owner(self):
+        self.client.get('/api/attendance/daily-report/')
+        self.client.get('/api/attendance/daily-report/')
+        
+        body = self.client.get('/api/metrics/').content.decode()
+        self.assertIn('http_request_duration_seconds_count{view="daily-report",method="GET"} 2', body)
+        self.assertIn('http_request_duration_seconds_bucket{view="daily-report",method="GET",le="+Inf"} 2', body)
+        self.assertIn('phase="db"', body)
+        
+        self.client.force_authenticate(self.teacher)
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 403)
+
+class DatabaseConfigTests(SimpleTestCase):
+    def test_sqlite_url_options_are_parsed(self):
+        config = database_config(
+            'sqlite:///db.sqlite3?timeout=30&pragmas=cache_size:-64000,temp_store:MEMORY', Path('/srv')
+        )
+        self.assertEqual(config['OPTIONS']['timeout'], 30.0)
+        
+        wrapper = DatabaseWrapper({**config, 'TIME_ZONE': None, 'NAME': ':memory:'})
+        params = wrapper.get_connection_params()
+        self.assertNotIn('pragmas', params)
+        self.assertEqual(wrapper.pragmas['cache_size'], '-64000')
+        self.assertEqual(wrapper.pragmas['journal_mode'], 'WAL')
+        self.assertNotIn('busy_timeout', wrapper.pragmas)
+    
+    def test_malformed_pragmas_are_rejected(self):
+        for value in ('cache_size', 'cache_size:1;DROP TABLE x', 'busy_timeout:5000', 42):
+            with self.assertRaises(ImproperlyConfigured):
+                parse_pragmas(value)
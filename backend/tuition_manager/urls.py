@@ -18,6 +18,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from .views import MetricsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -26,6 +27,9 @@ urlpatterns = [
     path('api/classes/', include('classes.urls')),
     path('api/attendance/', include('attendance.urls')),
     path('api/payments/', include('payments.urls')),
+    path('api/notifications/', include('notifications.urls')),
+    path('api/live/', include('live.urls')),
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
 ]
 
 if settings.DEBUG:
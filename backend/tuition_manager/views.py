@@ -0,0 +1,11 @@
+from django.http import HttpResponse
+from rest_framework.views import APIView
+from accounts.permissions import IsOwner
+from utils.metrics import registry
+
+class MetricsView(APIView):
+    """Request latency histograms in the Prometheus text format."""
+    permission_classes = (IsOwner,)
+    
+    def get(self, request):
+        return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
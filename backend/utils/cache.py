@@ -0,0 +1,105 @@
+import hashlib
+import json
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+def _version_key(label):
+    return f'response-version:{label}'
+
+def _bump(labels):
+    version = time.time_ns()
+    cache.set_many({_version_key(label): version for label in labels}, timeout=None)
+
+def invalidate_models(*models):
+    """Drop cached responses that depend on any of ``models``.
+    
+    Call this after writes that skip model signals, such as ``update()`` or
+    ``bulk_create()``. The bump happens now, so this process stops serving
+    old data, and again on commit, so a response cached from a concurrent
+    read of the old rows is dropped too.
+    """
+    labels = [model._meta.label for model in models]
+    _bump(labels)
+    transaction.on_commit(lambda: _bump(labels))
+
+def watch_model(model, ignore_fields=()):
+    """Invalidate cached responses for ``model`` on every save and delete.
+    
+    Saves limited by ``update_fields`` to ``ignore_fields`` are skipped.
+    """
+    ignore_fields = frozenset(ignore_fields)
+    
+    def saved(sender, instance, update_fields=None, **kwargs):
+        if update_fields and ignore_fields.issuperset(update_fields):
+            return
+        invalidate_models(sender)
+    
+    def deleted(sender, instance, **kwargs):
+        invalidate_models(sender)
+    
+    uid = f'response-cache:{model._meta.label}'
+    post_save.connect(saved, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(deleted, sender=model, weak=False, dispatch_uid=uid)
+
+def model_versions(models):
+    keys = [_version_key(model._meta.label) for model in models]
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        # Never fall back to a default version: an evicted counter must not
+        # line up with responses cached before it was evicted.
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+class CachedResponseMixin:
+    """Cache successful GET responses for a view that reads ``cache_models``.
+    
+    Entries are keyed by URL name, query parameters and the caller's role,
+    and carry an ETag so clients polling with ``If-None-Match`` get a 304.
+    Saving or deleting any of ``cache_models`` invalidates the entries.
+    Views that define their own ``get`` wrap it with ``cached_response``.
+    """
+    cache_models = ()
+    
+    def get_response_cache_key(self, request):
+        params = sorted(request.query_params.lists())
+        parts = [
+            request.resolver_match.view_name if request.resolver_match else request.path,
+            getattr(request.user, 'role', ''),
+            json.dumps(params),
+            *map(str, model_versions(self.cache_models)),
+        ]
+        return 'response:' + hashlib.sha256('|'.join(parts).encode()).hexdigest()
+    
+    def get(self, request, *args, **kwargs):
+        return self.cached_response(request, lambda: super(CachedResponseMixin, self).get(request, *args, **kwargs))
+    
+    def cached_response(self, request, build):
+        """Return the cached response for ``request``, calling ``build`` on a miss."""
+        key = self.get_response_cache_key(request)
+        cached = cache.get(key)
+        if cached is None:
+            response = build()
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            body = json.dumps(response.data, cls=DjangoJSONEncoder, sort_keys=True)
+            cached = ('"%s"' % hashlib.md5(body.encode()).hexdigest(), response.data)
+            cache.set(key, cached, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+        
+        etag, data = cached
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(data)
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -0,0 +1,72 @@
+import csv
+import datetime
+import tempfile
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+
+CHUNK_SIZE = 2000
+FORMULA_PREFIXES = ('=', '+', '-', '@')
+
+class Echo:
+    """File-like object whose ``write`` hands the line back to ``csv.writer``."""
+    
+    def write(self, value):
+        return value
+
+def _cell(value):
+    # Keep spreadsheet apps from evaluating user-entered text as a formula.
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+def _xlsx_value(value):
+    # Excel has no time zones; write aware datetimes in local time.
+    if isinstance(value, datetime.datetime) and timezone.is_aware(value):
+        return timezone.make_naive(value)
+    return _cell(value)
+
+def iter_rows(queryset, columns):
+    """Yield ``columns`` of ``queryset`` without loading it all at once."""
+    return queryset.values_list(*columns).iterator(chunk_size=CHUNK_SIZE)
+
+def csv_response(header, rows, filename):
+    """Stream ``rows`` as a CSV attachment one line at a time."""
+    writer = csv.writer(Echo())
+    
+    def lines():
+        yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow([_cell(value) for value in row])
+    
+    response = StreamingHttpResponse(lines(), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+    return response
+
+def xlsx_response(header, rows, filename):
+    """Write ``rows`` to an XLSX attachment using openpyxl's write-only mode.
+    
+    Rows go straight to a temporary file, which is streamed back and then
+    removed, so memory use does not grow with the export.
+    """
+    from openpyxl import Workbook
+    
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(filename[:31])
+    sheet.append(header)
+    for row in rows:
+        sheet.append([_xlsx_value(value) for value in row])
+    
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename=f'{filename}.xlsx',
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    )
+
+def export_response(file_type, header, rows, filename):
+    if file_type == 'xlsx':
+        return xlsx_response(header, rows, filename)
+    return csv_response(header, rows, filename)
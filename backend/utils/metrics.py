@@ -0,0 +1,147 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds in seconds, as in the Prometheus client defaults.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PHASES = ('db', 'serialize', 'sms')
+
+_timings = contextvars.ContextVar('request_timings', default=None)
+
+class RequestTimings:
+    """Seconds and call counts per phase for the request being handled."""
+    
+    def __init__(self):
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.counts = dict.fromkeys(PHASES, 0)
+    
+    def add(self, phase, seconds):
+        self.seconds[phase] += seconds
+        self.counts[phase] += 1
+
+def start_request():
+    timings = RequestTimings()
+    return timings, _timings.set(timings)
+
+def end_request(token):
+    _timings.reset(token)
+
+@contextmanager
+def timed(phase):
+    """Add the block's duration to ``phase`` of the current request, if any."""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - started)
+
+def sql_wrapper(execute, sql, params, many, context):
+    """``connection.execute_wrapper`` hook that times every query."""
+    with timed('db'):
+        return execute(sql, params, many, context)
+
+def time_queries(connection):
+    """Install ``sql_wrapper`` on ``connection`` for good.
+    
+    Outside a request the wrapper only costs a context variable lookup.
+    """
+    if sql_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(sql_wrapper)
+
+class Histogram:
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+    
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+
+class Registry:
+    """Per-process request metrics keyed by URL name and method.
+    
+    Each worker process keeps its own numbers; scrape every worker, or run
+    a single one, to see all traffic.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = {}
+        self.phase_seconds = {}
+        self.phase_calls = {}
+        self.responses = {}
+    
+    def observe(self, view, method, status, seconds, timings):
+        key = (view, method)
+        with self.lock:
+            self.latency.setdefault(key, Histogram()).observe(seconds)
+            self.responses[key + (str(status),)] = self.responses.get(key + (str(status),), 0) + 1
+            for phase in PHASES:
+                self.phase_seconds[key + (phase,)] = self.phase_seconds.get(key + (phase,), 0.0) + timings.seconds[phase]
+                self.phase_calls[key + (phase,)] = self.phase_calls.get(key + (phase,), 0) + timings.counts[phase]
+    
+    def reset(self):
+        with self.lock:
+            for table in (self.latency, self.phase_seconds, self.phase_calls, self.responses):
+                table.clear()
+    
+    def render(self):
+        """Return the metrics in the Prometheus text exposition format."""
+        lines = []
+        with self.lock:
+            lines += [
+                '# HELP http_request_duration_seconds Request wall time by URL name.',
+                '# TYPE http_request_duration_seconds histogram',
+            ]
+            for (view, method), histogram in sorted(self.latency.items()):
+                labels = f'view="{view}",method="{method}"'
+                for bound, count in zip(BUCKETS, histogram.buckets):
+                    lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f'http_request_duration_seconds_sum{{{labels}}} {histogram.sum:.6f}')
+                lines.append(f'http_request_duration_seconds_count{{{labels}}} {histogram.count}')
+            
+            lines += [
+                '# HELP http_responses_total Responses by URL name and status code.',
+                '# TYPE http_responses_total counter',
+            ]
+            for (view, method, status), count in sorted(self.responses.items()):
+                lines.append(f'http_responses_total{{view="{view}",method="{method}",status="{status}"}} {count}')
+            
+            lines += [
+                '# HELP http_request_phase_seconds_total Time spent in SQL, serializers and SMS calls.',
+                '# TYPE http_request_phase_seconds_total counter',
+            ]
+            for (view, method, phase), seconds in sorted(self.phase_seconds.items()):
+                lines.append(
+                    f'http_request_phase_seconds_total{{view="{view}",method="{method}",phase="{phase}"}} {seconds:.6f}'
+                )
+            
+            lines += [
+                '# HELP http_request_phase_calls_total SQL queries, serializer calls and SMS sends.',
+                '# TYPE http_request_phase_calls_total counter',
+            ]
+            for (view, method, phase), count in sorted(self.phase_calls.items()):
+                lines.append(f'http_request_phase_calls_total{{view="{view}",method="{method}",phase="{phase}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+registry = Registry()
+
+def server_timing(timings, seconds):
+    """Format a ``Server-Timing`` header value for one request."""
+    entries = [f'app;dur={seconds * 1000:.1f}']
+    for phase in PHASES:
+        if timings.counts[phase]:
+            entries.append(
+                f'{phase};dur={timings.seconds[phase] * 1000:.1f};desc="{timings.counts[phase]} call(s)"'
+            )
+    return ', '.join(entries)
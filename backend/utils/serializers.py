@@ -0,0 +1,27 @@
+from .metrics import timed
+
+class DynamicFieldsMixin:
+    """Trim serializer output to the comma separated ``fields`` query parameter.
+    
+    Only applies to GET requests, e.g. ``/api/students/?fields=id,full_name``.
+    Unknown names are ignored.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        
+        request = self.context.get('request')
+        if request is None or request.method != 'GET':
+            return
+        
+        fields = request.query_params.get('fields')
+        if not fields:
+            return
+        
+        requested = {name.strip() for name in fields.split(',')}
+        for name in set(self.fields) - requested:
+            self.fields.pop(name)
+    
+    def to_representation(self, instance):
+        with timed('serialize'):
+            return super().to_representation(instance)
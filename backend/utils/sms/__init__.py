@@ -0,0 +1,154 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.utils.module_loading import import_string
+from notifications.models import OutboundMessage
+from utils.metrics import timed
+
+# Messages recorded by the locmem and latency backends.
+outbox = []
+
+def get_connection(backend=None, **kwargs):
+    """Return an instance of ``backend`` or of ``settings.SMS_BACKEND``."""
+    return import_string(backend or settings.SMS_BACKEND)(**kwargs)
+
+class RateLimiter:
+    """Thread-safe token bucket allowing ``rate`` calls per second."""
+    
+    def __init__(self, rate):
+        self.rate = float(rate)
+        # Room for at least one token, so rates below 1/s still make progress.
+        self.capacity = max(self.rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        while self.rate > 0 and (wait := self.take()):
+            time.sleep(wait)
+    
+    def take(self):
+        """Take a token if one is available, else return seconds to wait."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+    
+    async def aacquire(self):
+        """``acquire`` for async code; waits on the event loop."""
+        while self.rate > 0 and (wait := self.take()):
+            await asyncio.sleep(wait)
+
+def deliver_sms(to_phone, message):
+    """Send one message through the configured backend and return its result dict."""
+    with timed('sms'):
+        return get_connection().send(to_phone, message)
+
+async def adeliver_sms(to_phone, message, connection=None):
+    """``deliver_sms`` for async code; pass ``connection`` to reuse its HTTP session."""
+    with timed('sms'):
+        return await (connection or get_connection()).asend(to_phone, message)
+
+async def adeliver_many(messages, concurrency, limiter=None):
+    """Send ``(to_phone, message)`` pairs with up to ``concurrency`` in flight.
+    
+    Uses one backend connection and, with an async backend, no threads;
+    result dicts come back in order. Each send waits for a token from
+    ``limiter`` when one is given.
+    """
+    connection = get_connection()
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def send(to_phone, message):
+        async with semaphore:
+            if limiter:
+                await limiter.aacquire()
+            return await adeliver_sms(to_phone, message, connection)
+    
+    try:
+        return await asyncio.gather(*(send(to_phone, message) for to_phone, message in messages))
+    finally:
+        await connection.aclose()
+
+def send_sms(to_phone, message):
+    return deliver_sms(to_phone, message)['status'] == 'sent'
+
+def broadcast_sms(phones, message, rate=None, workers=None):
+    """Send ``message`` to every phone concurrently under a shared rate limit."""
+    limiter = RateLimiter(settings.SMS_RATE_LIMIT if rate is None else rate)
+    
+    def send(phone):
+        limiter.acquire()
+        return deliver_sms(phone, message)
+    
+    with ThreadPoolExecutor(max_workers=workers or settings.SMS_BROADCAST_WORKERS) as pool:
+        return list(pool.map(send, phones))
+
+def queue_sms(to_phone, message, attendance=None, payment=None, kind='notice'):
+    """Add a message to the outbound queue; ``process_outbox`` delivers it."""
+    return OutboundMessage.objects.create(
+        phone=to_phone,
+        body=message,
+        kind=kind,
+        attendance=attendance,
+        payment=payment
+    )
+
+def attendance_message(student, class_name):
+    return f"Your child {student.full_name} has arrived for {class_name}."
+
+def payment_message(student, month, year):
+    return f"Your child's class fee for {month.capitalize()} {year} has been received."
+
+def payment_reminder_message(student_name, month, year):
+    return (
+        f"Your child {student_name}'s class fee for {month.capitalize()} {year} is overdue. "
+        f"Please settle it at your earliest convenience."
+    )
+
+def send_attendance_sms(student, class_name):
+    return send_sms(student.parent_phone, attendance_message(student, class_name))
+
+def send_payment_sms(student, month, year):
+    return send_sms(student.parent_phone, payment_message(student, month, year))
+
+def queue_attendance_sms(attendance):
+    message = attendance_message(attendance.student, attendance.class_attended.name)
+    return queue_sms(attendance.student.parent_phone, message, attendance=attendance)
+
+def bulk_queue_sms(messages, batch_size=500):
+    """Queue many messages at once; each item holds ``queue_sms`` keyword arguments."""
+    return OutboundMessage.objects.bulk_create(
+        [
+            OutboundMessage(
+                phone=m['to_phone'],
+                body=m['message'],
+                kind=m.get('kind', 'notice'),
+                attendance=m.get('attendance'),
+                payment=m.get('payment')
+            )
+            for m in messages
+        ],
+        batch_size=batch_size
+    )
+
+def bulk_queue_attendance_sms(attendances):
+    """Queue arrival messages for many attendance rows with a single insert."""
+    return bulk_queue_sms(
+        {
+            'to_phone': a.student.parent_phone,
+            'message': attendance_message(a.student, a.class_attended.name),
+            'attendance': a
+        }
+        for a in attendances
+    )
+
+def queue_payment_sms(payment):
+    message = payment_message(payment.student, payment.get_month_display(), payment.year)
+    return queue_sms(payment.student.parent_phone, message, payment=payment, kind='receipt')
@@ -0,0 +1,22 @@
+from asgiref.sync import sync_to_async
+
+class BaseSmsBackend:
+    """Base class for SMS backends.
+    
+    Subclasses implement ``send``, which delivers one message and returns a
+    result dict with at least ``to``, ``status`` (``sent``, ``failed`` or
+    ``not_configured``) and ``attempts``. Backends that can wait on the
+    gateway without a thread also override ``asend`` and ``aclose``.
+    """
+    
+    def __init__(self, **kwargs):
+        pass
+    
+    def send(self, to_phone, message):
+        raise NotImplementedError('subclasses of BaseSmsBackend must override send()')
+    
+    async def asend(self, to_phone, message):
+        return await sync_to_async(self.send, thread_sensitive=False)(to_phone, message)
+    
+    async def aclose(self):
+        pass
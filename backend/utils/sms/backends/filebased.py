@@ -0,0 +1,24 @@
+"""SMS backend that appends each message as a JSON line to ``SMS_FILE_PATH``."""
+import json
+import threading
+import uuid
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from .base import BaseSmsBackend
+
+_lock = threading.Lock()
+
+class SmsBackend(BaseSmsBackend):
+    def __init__(self, file_path=None, **kwargs):
+        super().__init__(**kwargs)
+        self.file_path = file_path or settings.SMS_FILE_PATH
+        if not self.file_path:
+            raise ImproperlyConfigured('The file-based SMS backend needs SMS_FILE_PATH to be set.')
+    
+    def send(self, to_phone, message):
+        sid = f'FB{uuid.uuid4().hex}'
+        record = {'sid': sid, 'to': to_phone, 'body': message, 'sent_at': timezone.now().isoformat()}
+        with _lock, open(self.file_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+        return {'to': to_phone, 'status': 'sent', 'attempts': 1, 'sid': sid}
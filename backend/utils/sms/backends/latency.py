@@ -0,0 +1,26 @@
+"""
+Backend that simulates a slow SMS gateway for load tests.
+
+Each send sleeps for ``SMS_SIMULATED_LATENCY`` seconds (plus up to
+``SMS_SIMULATED_JITTER`` seconds) and then records the message like the
+locmem backend.
+"""
+import asyncio
+import random
+import time
+from django.conf import settings
+from . import locmem
+
+class SmsBackend(locmem.SmsBackend):
+    def __init__(self, latency=None, jitter=None, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = settings.SMS_SIMULATED_LATENCY if latency is None else latency
+        self.jitter = settings.SMS_SIMULATED_JITTER if jitter is None else jitter
+    
+    def send(self, to_phone, message):
+        time.sleep(self.latency + random.uniform(0, self.jitter))
+        return super().send(to_phone, message)
+    
+    async def asend(self, to_phone, message):
+        await asyncio.sleep(self.latency + random.uniform(0, self.jitter))
+        return super().send(to_phone, message)
@@ -0,0 +1,23 @@
+"""
+Backend for test environments and load tests.
+
+Messages are appended to ``utils.sms.outbox`` instead of being sent.
+"""
+import itertools
+import threading
+from .base import BaseSmsBackend
+
+_sids = itertools.count(1)
+_lock = threading.Lock()
+
+class SmsBackend(BaseSmsBackend):
+    def send(self, to_phone, message):
+        from utils import sms
+        
+        with _lock:
+            sid = f'LM{next(_sids):032d}'
+            sms.outbox.append({'to': to_phone, 'body': message, 'sid': sid})
+        return {'to': to_phone, 'status': 'sent', 'attempts': 1, 'sid': sid}
+    
+    async def asend(self, to_phone, message):
+        return self.send(to_phone, message)
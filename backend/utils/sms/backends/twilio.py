@@ -0,0 +1,166 @@
+"""Twilio SMS backend."""
+import asyncio
+import re
+import threading
+import time
+from aiohttp import ClientConnectorError, ClientSession, ClientTimeout
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError, ConnectTimeout
+from twilio.base.exceptions import TwilioRestException
+from twilio.http.async_http_client import AsyncTwilioHttpClient
+from twilio.http.http_client import TwilioHttpClient
+from twilio.rest import Client
+from urllib3.exceptions import NewConnectionError
+from .base import BaseSmsBackend
+
+class GatewayHttpClient(TwilioHttpClient):
+    """Twilio HTTP client with a shared, sized connection pool.
+    
+    ``base_url`` replaces the Twilio API host, which lets the SMS code run
+    against a local fake gateway.
+    """
+    
+    def __init__(self, base_url='', pool_size=10, timeout=None):
+        super().__init__(pool_connections=True, timeout=timeout)
+        adapter = HTTPAdapter(pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.base_url = base_url.rstrip('/')
+    
+    def request(self, method, url, *args, **kwargs):
+        if self.base_url:
+            url = re.sub(r'^https?://[^/]+', self.base_url, url)
+        return super().request(method, url, *args, **kwargs)
+
+class AsyncGatewayHttpClient(AsyncTwilioHttpClient):
+    """aiohttp counterpart of ``GatewayHttpClient`` for Twilio's ``*_async`` calls.
+    
+    The session belongs to the event loop it was created on, so create one
+    client per loop and ``close`` it when done.
+    """
+    
+    def __init__(self, base_url='', timeout=None):
+        super().__init__(pool_connections=False)
+        self.session = ClientSession(timeout=ClientTimeout(total=timeout))
+        self.base_url = base_url.rstrip('/')
+    
+    async def request(self, method, url, *args, **kwargs):
+        if self.base_url:
+            url = re.sub(r'^https?://[^/]+', self.base_url, url)
+        return await super().request(method, url, *args, **kwargs)
+
+_client = None
+_client_key = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """Return the process-wide Twilio client, rebuilt only when settings change."""
+    global _client, _client_key
+    key = (settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN, settings.TWILIO_API_BASE_URL)
+    with _client_lock:
+        if _client is None or _client_key != key:
+            _client = Client(
+                settings.TWILIO_ACCOUNT_SID,
+                settings.TWILIO_AUTH_TOKEN,
+                http_client=GatewayHttpClient(
+                    base_url=settings.TWILIO_API_BASE_URL,
+                    pool_size=max(settings.SMS_BROADCAST_WORKERS, settings.SMS_OUTBOX_WORKERS),
+                    timeout=settings.SMS_TIMEOUT
+                )
+            )
+            _client_key = key
+        return _client
+
+def _not_delivered(exc):
+    """Whether ``exc`` shows the request never reached the gateway.
+    
+    A read timeout or dropped connection may come after Twilio accepted the
+    message, so retrying it could text the parent twice.
+    """
+    if isinstance(exc, (ConnectTimeout, ClientConnectorError)):
+        return True
+    if isinstance(exc, RequestsConnectionError) and exc.args:
+        return isinstance(getattr(exc.args[0], 'reason', None), NewConnectionError)
+    return False
+
+def _failure(exc):
+    """Return ``(retryable, error)`` for an exception raised while sending."""
+    if isinstance(exc, TwilioRestException):
+        return exc.status == 429 or exc.status >= 500, f"{exc.status}: {exc.msg}"
+    return _not_delivered(exc), str(exc)
+
+def _configured():
+    return all([settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN, settings.TWILIO_PHONE_NUMBER])
+
+class SmsBackend(BaseSmsBackend):
+    """Send through Twilio, retrying 429, 5xx and connect errors with exponential backoff.
+    
+    ``asend`` goes through an aiohttp client owned by this backend instance;
+    ``aclose`` it from the same event loop.
+    """
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.async_client = None
+    
+    def send(self, to_phone, message):
+        if not _configured():
+            print(f"Twilio not configured. Would send SMS to {to_phone}: {message}")
+            return {'to': to_phone, 'status': 'not_configured', 'attempts': 0}
+        
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                sent = get_client().messages.create(
+                    body=message,
+                    from_=settings.TWILIO_PHONE_NUMBER,
+                    to=to_phone
+                )
+                return {'to': to_phone, 'status': 'sent', 'attempts': attempts, 'sid': sent.sid}
+            except Exception as e:
+                retryable, error = _failure(e)
+            
+            if not retryable or attempts > settings.SMS_MAX_RETRIES:
+                print(f"Failed to send SMS: {error}")
+                return {'to': to_phone, 'status': 'failed', 'attempts': attempts, 'error': error}
+            time.sleep(settings.SMS_RETRY_BACKOFF * 2 ** (attempts - 1))
+    
+    async def asend(self, to_phone, message):
+        if not _configured():
+            print(f"Twilio not configured. Would send SMS to {to_phone}: {message}")
+            return {'to': to_phone, 'status': 'not_configured', 'attempts': 0}
+        
+        if self.async_client is None:
+            self.async_client = Client(
+                settings.TWILIO_ACCOUNT_SID,
+                settings.TWILIO_AUTH_TOKEN,
+                http_client=AsyncGatewayHttpClient(
+                    base_url=settings.TWILIO_API_BASE_URL,
+                    timeout=settings.SMS_TIMEOUT
+                )
+            )
+        
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                sent = await self.async_client.messages.create_async(
+                    body=message,
+                    from_=settings.TWILIO_PHONE_NUMBER,
+                    to=to_phone
+                )
+                return {'to': to_phone, 'status': 'sent', 'attempts': attempts, 'sid': sent.sid}
+            except Exception as e:
+                retryable, error = _failure(e)
+            
+            if not retryable or attempts > settings.SMS_MAX_RETRIES:
+                print(f"Failed to send SMS: {error}")
+                return {'to': to_phone, 'status': 'failed', 'attempts': attempts, 'error': error}
+            await asyncio.sleep(settings.SMS_RETRY_BACKOFF * 2 ** (attempts - 1))
+    
+    async def aclose(self):
+        if self.async_client is not None:
+            await self.async_client.http_client.close()
+            self.async_client = None
@@ -0,0 +1,140 @@
+import datetime
+import json
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from accounts.models import User
+from classes.models import Class
+from students.models import Student
+
+class APIFixtureTestCase(APITestCase):
+    """API test case with an owner, a teacher, fixture builders and a temporary MEDIA_ROOT."""
+    
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.media_override = override_settings(
+            MEDIA_ROOT=cls.media_root,
+            QR_CODE_DIR=Path(cls.media_root) / 'qr_codes'
+        )
+        cls.media_override.enable()
+        (Path(cls.media_root) / 'qr_codes').mkdir()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.media_override.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        super().tearDownClass()
+    
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user('owner', password='secret', role='owner')
+        self.teacher = User.objects.create_user('teacher', password='secret', role='teacher')
+        self.client.force_authenticate(self.owner)
+        self.created = 0
+    
+    def create_class(self, teacher=None):
+        return Class.objects.create(
+            name=f'Class {Class.objects.count() + 1}',
+            subject='Mathematics',
+            teacher=teacher or self.teacher,
+            fee_per_month=3000,
+            schedule='Mon/Wed 4-6 PM'
+        )
+    
+    def create_students(self, count, assigned_class=None):
+        assigned_class = assigned_class or self.create_class()
+        students = []
+        for _ in range(count):
+            self.created += 1
+            students.append(Student.objects.create(
+                full_name=f'Student {self.created}',
+                date_of_birth=datetime.date(2012, 1, 1),
+                parent_name='Parent',
+                parent_phone=f'+9477{self.created:07d}',
+                address='Colombo',
+                assigned_class=assigned_class
+            ))
+        return students
+    
+class ListQueryCountTestCase(APIFixtureTestCase):
+    """Base class for tests guarding list endpoints against N+1 queries."""
+    
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+    
+    def assertConstantQueries(self, url, add_rows, sizes=(3, 15)):
+        """Fail if listing ``url`` costs more queries as ``add_rows`` adds rows."""
+        counts = []
+        for size in sizes:
+            add_rows(size)
+            counts.append(self.count_queries(url))
+        self.assertEqual(
+            len(set(counts)), 1,
+            f'{url} query count grows with row count: {dict(zip(sizes, counts))}'
+        )
+
+
+class FakeSmsGateway:
+    """Local HTTP server answering Twilio's Messages API.
+    
+    ``responses`` maps a recipient number to a list of status codes returned
+    for successive attempts; anything else gets ``201``. Received messages
+    are recorded in ``requests``. Point ``TWILIO_API_BASE_URL`` at ``url``.
+    """
+    
+    def __init__(self, responses=None):
+        self.responses = {to: list(codes) for to, codes in (responses or {}).items()}
+        self.requests = []
+        self.lock = threading.Lock()
+        gateway = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode()).items()}
+                with gateway.lock:
+                    gateway.requests.append(form)
+                    codes = gateway.responses.get(form.get('To'), [])
+                    code = codes.pop(0) if codes else 201
+                    sid = f'SM{len(gateway.requests):032d}'
+                
+                body = {'sid': sid, 'to': form.get('To'), 'body': form.get('Body'), 'status': 'queued'}
+                if code >= 400:
+                    body = {'code': 20000 + code, 'message': f'Fake gateway error {code}', 'status': code}
+                payload = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+    
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def sent_to(self):
+        return [r.get('To') for r in self.requests]
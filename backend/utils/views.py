@@ -0,0 +1,70 @@
+import inspect
+from asgiref.sync import sync_to_async
+from rest_framework.views import APIView
+
+class AsyncAPIView(APIView):
+    """``APIView`` whose handlers are coroutines, for the ASGI app.
+    
+    DRF 3.14 only dispatches synchronously. This runs the same
+    authentication, permission and throttle checks and the same exception
+    handling around an ``async def`` handler. Authenticators with an
+    ``aauthenticate`` method are awaited, so trusted token claims need no
+    thread.
+    """
+    
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # APIView.as_view wraps the view in csrf_exempt, which hides the
+        # coroutine from Django 4.2; mark the view exempt directly instead.
+        view = super(APIView, cls).as_view(**initkwargs)
+        view.cls = cls
+        view.initkwargs = initkwargs
+        view.csrf_exempt = True
+        return view
+    
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        
+        try:
+            await self.aperform_authentication(request)
+            if self.throttle_classes:
+                # Throttles read and write the cache synchronously.
+                await sync_to_async(self.initial)(request, *args, **kwargs)
+            else:
+                self.initial(request, *args, **kwargs)
+            
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+    
+    async def aperform_authentication(self, request):
+        """Set ``request.user`` and ``request.auth`` as ``Request._authenticate`` would."""
+        for authenticator in request.authenticators:
+            try:
+                if hasattr(authenticator, 'aauthenticate'):
+                    user_auth_tuple = await authenticator.aauthenticate(request)
+                else:
+                    user_auth_tuple = await sync_to_async(authenticator.authenticate)(request)
+            except Exception:
+                request._not_authenticated()
+                raise
+            
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+        
+        request._not_authenticated()
@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react'
 import { BarChart3, Calendar, DollarSign, Users } from 'lucide-react'
 import api from '../utils/api'
+import { subscribeLiveFeed } from '../utils/liveFeed'
 
 function Reports() {
   const [stats, setStats] = useState({
@@ -15,6 +16,21 @@ function Reports() {
   
   useEffect(() => {
     fetchStats()
+    return subscribeLiveFeed({
+      attendance: () => setStats(prev => ({ ...prev, todayAttendance: prev.todayAttendance + 1 })),
+      payment: (payment) => setStats(prev => {
+        const currentMonth = new Date().toLocaleDateString('en-US', { month: 'long' }).toLowerCase()
+        const amount = parseFloat(payment.amount)
+        const wasOutstanding = payment.previous_status === 'pending' || payment.previous_status === 'overdue'
+        return {
+          ...prev,
+          monthlyIncome: prev.monthlyIncome +
+            (payment.month === currentMonth && payment.year === new Date().getFullYear() ? amount : 0),
+          outstandingPayments: prev.outstandingPayments - (wasOutstanding ? amount : 0),
+        }
+      }),
+      resync: () => fetchStats(),
+    })
   }, [])
   
   const fetchStats = async () => {
@@ -2,6 +2,7 @@ import { useState, useEffect } from 'react'
 import { Calendar, Users, BookOpen, CheckCircle } from 'lucide-react'
 import { useAuth } from '../contexts/AuthContext'
 import api from '../utils/api'
+import { subscribeLiveFeed } from '../utils/liveFeed'
 
 function TeacherHome() {
   const { user } = useAuth()
@@ -16,6 +17,13 @@ function TeacherHome() {
   
   useEffect(() => {
     fetchTeacherData()
+    return subscribeLiveFeed({
+      attendance: (record) => {
+        setStats(prev => ({ ...prev, todayAttendance: prev.todayAttendance + 1 }))
+        setRecentAttendance(prev => [{ ...record, time_in: record.time }, ...prev])
+      },
+      resync: () => fetchTeacherData(),
+    })
   }, [])
   
   const fetchTeacherData = async () => {
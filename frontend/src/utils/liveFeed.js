@@ -0,0 +1,54 @@
+import api from './api'
+
+const RETRY_MS = 3000
+
+// Subscribes to the server's live event stream. `handlers` maps event types
+// ('attendance', 'payment', 'resync') to callbacks. Returns an unsubscribe function.
+// EventSource cannot send the access token, so every connection is opened with
+// a short-lived ticket and reopened with a new one instead of retrying the old URL.
+export function subscribeLiveFeed(handlers) {
+  if (!localStorage.getItem('token') || typeof EventSource === 'undefined') {
+    return () => {}
+  }
+  
+  let source = null
+  let timer = null
+  let closed = false
+  
+  const reconnect = () => {
+    timer = setTimeout(connect, RETRY_MS)
+  }
+  
+  const connect = async () => {
+    let ticket
+    try {
+      ticket = (await api.post('/live/ticket/')).data.ticket
+    } catch (err) {
+      if (![401, 403].includes(err.response?.status)) {
+        reconnect()
+      }
+      return
+    }
+    if (closed) {
+      return
+    }
+    
+    source = new EventSource(`/api/live/feed/?ticket=${encodeURIComponent(ticket)}`)
+    Object.entries(handlers).forEach(([type, handler]) => {
+      source.addEventListener(type, (event) => handler(JSON.parse(event.data)))
+    })
+    source.onerror = () => {
+      source.close()
+      reconnect()
+    }
+  }
+  
+  connect()
+  return () => {
+    closed = true
+    clearTimeout(timer)
+    if (source) {
+      source.close()
+    }
+  }
+}